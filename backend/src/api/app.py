@@ -1,21 +1,39 @@
 from __future__ import annotations
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .routes.index import router as index_router
 from .routes.ingest import router as ingest_router
 from .routes.sections import router as sections_router
-from .routes.reports import router as reports_router
-from .routes.sections import router as sections_router
+from .routes.reports import router as reports_router, close_webhook_client, shutdown_cpu_pool
 from .routes.admin_prompts import router as admin_prompts_router
 from api.routes.admin_frameworks import router as admin_frameworks_router
 
 from dotenv import load_dotenv
 
+from .logging_config import setup_logging
+
 load_dotenv()
+setup_logging()
+
+# Warm tiktoken's cl100k_base encoding at import time: the BPE rank
+# table costs several MB and hundreds of ms to build, and when workers
+# are forked from a preloaded master (gunicorn --preload) the pages are
+# shared copy-on-write instead of rebuilt in every worker. tiktoken
+# caches the Encoding in its own registry, so the chunkers pick this
+# instance up.
+try:
+    import tiktoken
+
+    tiktoken.get_encoding("cl100k_base").encode("warmup")
+except Exception:
+    pass
 
 
-app = FastAPI()
+# orjson's C encoder beats the stdlib json path for the YAML-derived dicts
+# most endpoints return
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,8 +47,19 @@ app.include_router(index_router)
 app.include_router(ingest_router)
 app.include_router(sections_router)
 app.include_router(reports_router)
-app.include_router(admin_prompts_router)
-app.include_router(admin_frameworks_router)
+
+# Admin routes live in a mounted sub-app: the top-level router does one
+# /admin prefix test instead of scanning every admin route per request.
+admin_app = FastAPI(default_response_class=ORJSONResponse)
+admin_app.include_router(admin_prompts_router)
+admin_app.include_router(admin_frameworks_router)
+app.mount("/admin", admin_app)
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    await close_webhook_client()
+    shutdown_cpu_pool()
+
 
 def create_app() -> FastAPI:
     return app
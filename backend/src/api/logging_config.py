@@ -0,0 +1,31 @@
+# backend/src/api/logging_config.py
+from __future__ import annotations
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """
+    Route all logging through a queue so record formatting and the actual
+    stderr write happen on a background thread. Handlers never block the
+    event loop (or hold the GIL) on a slow stdout/stderr pipe.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers[:] = [QueueHandler(q)]
+    _listener = QueueListener(q, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
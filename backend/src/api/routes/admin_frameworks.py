@@ -1,61 +1,127 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-import re
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import functools
+import os
 import shutil
+import tempfile
+import aiofiles
 import yaml
 import json
 from datetime import datetime
 
-router = APIRouter(prefix="/admin/frameworks", tags=["admin-frameworks"])
+try:  # libyaml C bindings when available (~5-10x faster parse/emit)
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# mounted under /admin in app.py, so only the local prefix here
+router = APIRouter(prefix="/frameworks", tags=["admin-frameworks"])
 
 # backend/src/guidelines/<framework>/{chunks/, source/, prompts.yaml}
 GUIDELINES_DIR = Path(__file__).resolve().parents[2] / "guidelines"
 
-_slug_re = re.compile(r"^[a-z0-9][a-z0-9_\-]{1,63}$")
+# Allow-list as raw byte tables: bytes.translate(None, allowed) deletes every
+# permitted character, so a clean slug translates to b"". This runs entirely
+# in C with no regex interpreter overhead.
+_SLUG_ALLOWED = b"abcdefghijklmnopqrstuvwxyz0123456789_-"
+_SLUG_START = frozenset(b"abcdefghijklmnopqrstuvwxyz0123456789")
 
 
 # -----------------------
 # Helpers
 # -----------------------
 def _validate_slug(slug: str) -> str:
-    if not isinstance(slug, str) or not slug.strip() or not _slug_re.match(slug.strip()):
+    s = slug.strip() if isinstance(slug, str) else ""
+    b = s.encode("ascii", "ignore")
+    if (
+        len(b) != len(s)
+        or not 2 <= len(b) <= 64
+        or b[0] not in _SLUG_START
+        or b.translate(None, _SLUG_ALLOWED)
+    ):
         raise HTTPException(
             status_code=400,
             detail="Invalid framework slug. Use 2-64 chars: a-z0-9, '_' or '-', start with a-z0-9.",
         )
-    return slug.strip()
+    return s
 
 
+# Path is immutable, so memoizing the per-slug paths is safe and saves
+# the repeated __truediv__ allocations on every request for a framework.
+@functools.lru_cache(maxsize=512)
 def _fw_dir(slug: str) -> Path:
     return GUIDELINES_DIR / slug
 
 
+@functools.lru_cache(maxsize=512)
 def _chunks_dir(slug: str) -> Path:
     return _fw_dir(slug) / "chunks"
 
 
+@functools.lru_cache(maxsize=512)
 def _source_dir(slug: str) -> Path:
     return _fw_dir(slug) / "source"
 
 
+@functools.lru_cache(maxsize=512)
 def _prompts_path(slug: str) -> Path:
     return _fw_dir(slug) / "prompts.yaml"
 
 
+def _write_sidecar(path: Path, data: Dict[str, Any]) -> None:
+    """Atomically write a .json sidecar so reads can skip the YAML parse."""
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=".fw.", dir=str(path.parent))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path.with_suffix(".json"))
+    except OSError:
+        pass
+
+
 def _load_yaml(path: Path) -> Dict[str, Any]:
     try:
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        sidecar = path.with_suffix(".json")
+        try:
+            if sidecar.stat().st_mtime >= path.stat().st_mtime:
+                return json.loads(sidecar.read_bytes()) or {}
+        except (OSError, ValueError):
+            pass
+        data = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
+        _write_sidecar(path, data)
+        return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Invalid YAML: {e}")
 
 
+# parents we've already created/seen, so repeat saves skip the mkdir stat
+_known_parents: set = set()
+
+
 def _save_yaml(path: Path, data: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, sort_keys=False, allow_unicode=True)
+    parent = path.parent
+    if str(parent) not in _known_parents:
+        parent.mkdir(parents=True, exist_ok=True)
+        _known_parents.add(str(parent))
+    # write to a temp file in the same dir and rename, so a crash mid-write
+    # can never leave a truncated prompts.yaml behind
+    fd, tmp = tempfile.mkstemp(prefix=".fw.", dir=str(parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            yaml.dump(data, f, Dumper=_YamlDumper, sort_keys=False, allow_unicode=True)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _write_sidecar(path, data)
 
 
 def _default_prompts(display_name: str, framework_slug: str) -> Dict[str, Any]:
@@ -92,6 +158,42 @@ def _default_prompts(display_name: str, framework_slug: str) -> Dict[str, Any]:
     }
 
 
+_UPLOAD_CHUNK = 1 << 20  # 1 MiB; small chunks make syscall overhead dominate
+
+
+async def _stream_upload_to(file: UploadFile, dest: Path) -> None:
+    """
+    Copy an UploadFile to dest without buffering it in memory.
+
+    If the spooled upload already rolled over to a real file we let the
+    kernel copy it with sendfile; otherwise stream in 1 MiB chunks so the
+    event loop stays free between reads. Calling fileno() on a still
+    in-memory spool would force it to disk first — the opposite of a fast
+    path — so only rolled uploads take the fd route.
+    """
+    src_fd = None
+    if getattr(getattr(file, "file", None), "_rolled", False):
+        try:
+            src_fd = file.file.fileno()
+        except (AttributeError, OSError, ValueError):
+            src_fd = None
+    if src_fd is not None:
+        size = os.fstat(src_fd).st_size
+        with open(dest, "wb") as out:
+            # a single sendfile may copy less than asked (Linux caps one
+            # call around 2 GiB); advance the offset until done
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(out.fileno(), src_fd, offset, size - offset)
+                if sent == 0:
+                    break  # source hit EOF early; nothing more to copy
+                offset += sent
+        return
+    async with aiofiles.open(dest, "wb") as out:
+        while chunk := await file.read(_UPLOAD_CHUNK):
+            await out.write(chunk)
+
+
 def _ensure_framework_exists(slug: str) -> None:
     if not _fw_dir(slug).exists():
         raise HTTPException(status_code=404, detail=f"Framework not found: {slug}")
@@ -101,31 +203,69 @@ def _ensure_framework_exists(slug: str) -> None:
 # APIs
 # -----------------------
 
-@router.get("")
-def list_frameworks():
+# list_frameworks response memoized on the guidelines dir mtime; mutating
+# endpoints invalidate explicitly since nested changes don't bump that mtime.
+_frameworks_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def _invalidate_frameworks_cache() -> None:
+    global _frameworks_cache
+    _frameworks_cache = None
+
+
+@router.get("", response_class=ORJSONResponse)
+async def list_frameworks():
     """
     Lists framework folders under guidelines/.
     """
+    global _frameworks_cache
     if not GUIDELINES_DIR.exists():
         return {"frameworks": []}
 
+    mtime = GUIDELINES_DIR.stat().st_mtime
+    if _frameworks_cache is not None and _frameworks_cache[0] == mtime:
+        return _frameworks_cache[1]
+
+    resp = await asyncio.to_thread(_scan_frameworks)
+    _frameworks_cache = (mtime, resp)
+    return resp
+
+
+def _scan_frameworks() -> Dict[str, Any]:
+    with os.scandir(GUIDELINES_DIR) as it:
+        entries = sorted(
+            (e for e in it if e.is_dir(follow_symlinks=False) and not e.name.startswith(".")),
+            key=lambda e: e.name,
+        )
+
     out: List[Dict[str, Any]] = []
-    for p in sorted(GUIDELINES_DIR.iterdir(), key=lambda x: x.name):
-        if not p.is_dir() or p.name.startswith("."):
-            continue
-        slug = p.name
+    for entry in entries:
+        has_prompts = has_chunks = has_source = False
+        source_files: List[str] = []
+        with os.scandir(entry.path) as sub:
+            for child in sub:
+                if child.name == "prompts.yaml" and child.is_file():
+                    has_prompts = True
+                elif child.is_dir(follow_symlinks=False):
+                    if child.name == "chunks":
+                        has_chunks = True
+                    elif child.name == "source":
+                        has_source = True
+                        with os.scandir(child.path) as src_it:
+                            source_files = [f.name for f in src_it if f.is_file()]
         out.append({
-            "slug": slug,
-            "has_prompts": _prompts_path(slug).exists(),
-            "has_chunks": _chunks_dir(slug).exists(),
-            "has_source": _source_dir(slug).exists(),
-            "source_files": [f.name for f in _source_dir(slug).glob("*") if f.is_file()] if _source_dir(slug).exists() else [],
+            "slug": entry.name,
+            "has_prompts": has_prompts,
+            "has_chunks": has_chunks,
+            "has_source": has_source,
+            "source_files": source_files,
         })
+
     return {"frameworks": out}
 
 
 @router.post("")
-def create_framework(body: Dict[str, Any]):
+async def create_framework(body: Dict[str, Any]):
     """
     1) Create framework skeleton (folders only).
     Does NOT upload methodology, does NOT create prompts unless requested.
@@ -165,10 +305,11 @@ def create_framework(body: Dict[str, Any]):
             src = _prompts_path(clone_from)
             if not src.exists():
                 raise HTTPException(status_code=404, detail=f"clone_prompts_from prompts.yaml not found: {clone_from}")
-            shutil.copyfile(src, _prompts_path(slug))
+            await asyncio.to_thread(shutil.copyfile, src, _prompts_path(slug))
         else:
-            _save_yaml(_prompts_path(slug), _default_prompts(display_name, slug))
+            await asyncio.to_thread(_save_yaml, _prompts_path(slug), _default_prompts(display_name, slug))
 
+    _invalidate_frameworks_cache()
     return {
         "status": "ok",
         "created": slug,
@@ -177,7 +318,7 @@ def create_framework(body: Dict[str, Any]):
 
 
 @router.post("/{framework}/methodology")
-def upload_methodology(
+async def upload_methodology(
     framework: str,
     file: UploadFile = File(...),
     overwrite: bool = True,
@@ -208,13 +349,13 @@ def upload_methodology(
     if dest.exists() and not overwrite:
         raise HTTPException(status_code=409, detail=f"File already exists: {dest.name}")
 
-    with open(dest, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    await _stream_upload_to(file, dest)
 
+    _invalidate_frameworks_cache()
     return {"status": "ok", "framework": framework, "saved": f"source/{dest.name}"}
 
 
-@router.get("/{framework}/methodology")
+@router.get("/{framework}/methodology", response_class=ORJSONResponse)
 def list_methodology_files(framework: str):
     """
     List files under guidelines/<framework>/source/
@@ -246,6 +387,7 @@ def put_prompts(framework: str, body: Dict[str, Any]):
         raise HTTPException(status_code=400, detail="'sections' must be a list")
 
     _save_yaml(_prompts_path(framework), body)
+    _invalidate_frameworks_cache()
     return {"status": "ok", "framework": framework, "updated": "prompts.yaml"}
 
 
@@ -269,6 +411,7 @@ def create_default_prompts(framework: str, body: Optional[Dict[str, Any]] = None
         raise HTTPException(status_code=409, detail="prompts.yaml already exists")
 
     _save_yaml(p, _default_prompts(str(display_name), framework))
+    _invalidate_frameworks_cache()
     return {"status": "ok", "framework": framework, "created": "prompts.yaml"}
 
 
@@ -295,6 +438,7 @@ def clone_prompts(framework: str, body: Dict[str, Any]):
         raise HTTPException(status_code=409, detail="prompts.yaml already exists")
 
     shutil.copyfile(src, dst)
+    _invalidate_frameworks_cache()
     return {"status": "ok", "framework": framework, "cloned_from": src_fw}
 
 @router.patch("/{framework}")
@@ -2,87 +2,323 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
-from typing import Any, Dict, List
+from fastapi.responses import ORJSONResponse
+from typing import Any, Dict, List, Tuple
+from collections import OrderedDict
 from pathlib import Path
+import asyncio
+import bisect
+import copy
+import json
+import operator
+import os
+import tempfile
 import yaml
 
-router = APIRouter(prefix="/admin/prompts", tags=["admin-prompts"])
+try:  # libyaml C bindings when available (~5-10x faster parse/emit)
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# mounted under /admin in app.py, so only the local prefix here
+router = APIRouter(prefix="/prompts", tags=["admin-prompts"])
 
 # guidelines dir: backend/src/guidelines/<framework>/prompts.yaml
 GUIDELINES_DIR = Path(__file__).resolve().parents[2] / "guidelines"
 
+# Parsed-YAML cache keyed by path; entries are (mtime, size, parsed dict).
+# Bounded LRU so a long-lived process can't grow without limit.
+_YAML_CACHE: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+_YAML_CACHE_MAX = 100
+
+# Per-framework write locks: concurrent PATCH/POST to the same prompts.yaml
+# would otherwise race the load->mutate->save cycle. Per-slug locks keep
+# writes to different frameworks parallel; the guard only protects the
+# lock dict itself.
+_locks: Dict[str, asyncio.Lock] = {}
+_locks_guard = asyncio.Lock()
+
+
+async def _fw_lock(slug: str) -> asyncio.Lock:
+    async with _locks_guard:
+        return _locks.setdefault(slug, asyncio.Lock())
+
 
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
+# Frameworks whose prompts.yaml we've already seen on disk. Lets the hot
+# path skip a stat() per request; a miss falls through to the real check
+# (and repopulates), so new frameworks are picked up without coordination.
+_existing_prompts: set = set()
+_existing_scanned = False
+
+
+def _scan_existing_prompts() -> None:
+    global _existing_scanned
+    try:
+        with os.scandir(GUIDELINES_DIR) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False) and os.path.isfile(
+                    os.path.join(entry.path, "prompts.yaml")
+                ):
+                    _existing_prompts.add(entry.name)
+    except OSError:
+        pass
+    _existing_scanned = True
+
+
 def _prompts_path(framework: str) -> Path:
+    global _existing_scanned
+    if not _existing_scanned:
+        _scan_existing_prompts()
     p = GUIDELINES_DIR / framework / "prompts.yaml"
+    if framework in _existing_prompts:
+        return p
     if not p.exists():
         raise HTTPException(
             status_code=404,
             detail=f"prompts.yaml not found for framework '{framework}'",
         )
+    _existing_prompts.add(framework)
     return p
 
 
-def _load_yaml(path: Path) -> Dict[str, Any]:
+def _cache_put(path: Path, data: Dict[str, Any]) -> None:
+    try:
+        st = path.stat()
+    except OSError:
+        return
+    _YAML_CACHE[str(path)] = (st.st_mtime, st.st_size, data)
+    _YAML_CACHE.move_to_end(str(path))
+    while len(_YAML_CACHE) > _YAML_CACHE_MAX:
+        _YAML_CACHE.popitem(last=False)
+
+
+def _sidecar_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+def _write_sidecar(path: Path, data: Dict[str, Any]) -> None:
+    """Atomically write the .json sidecar next to a prompts.yaml."""
+    try:
+        sidecar = _sidecar_path(path)
+        fd, tmp = tempfile.mkstemp(prefix=".prompts.", dir=str(path.parent))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, sidecar)
+    except OSError:
+        # sidecar is an optimization only; never fail the request over it
+        pass
+
+
+def _normalize(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Precondition the schema once at load so endpoints can index directly."""
+    data.setdefault("overarching", "")
+    data.setdefault("sections", [])
+    if data["sections"] is None:
+        data["sections"] = []
+    for s in data["sections"]:
+        s.setdefault("enabled", True)
+        # hand-edited files may omit position; default it here so sort
+        # keys can index directly without a per-item .get
+        s.setdefault("position", 0)
+    return data
+
+
+def _load_yaml(path: Path, *, readonly: bool = False) -> Dict[str, Any]:
+    """
+    Load (and cache) a prompts file.
+
+    readonly=True hands back the cached dict itself — deepcopy is the
+    expensive part of a cache hit, and GET handlers only serialize the
+    result. Mutating endpoints must keep the default copy semantics.
+    """
     try:
-        return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        st = path.stat()
+        key = str(path)
+        entry = _YAML_CACHE.get(key)
+        if entry is not None and (entry[0], entry[1]) == (st.st_mtime, st.st_size):
+            _YAML_CACHE.move_to_end(key)
+            return entry[2] if readonly else copy.deepcopy(entry[2])
+        # Prefer the JSON sidecar when it is at least as fresh as the YAML:
+        # json.loads is an order of magnitude faster than a YAML parse.
+        sidecar = _sidecar_path(path)
+        data = None
+        try:
+            if sidecar.stat().st_mtime >= st.st_mtime:
+                data = json.loads(sidecar.read_bytes()) or {}
+        except (OSError, ValueError):
+            data = None
+        if data is None:
+            data = yaml.load(path.read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
+            _write_sidecar(path, data)
+        _normalize(data)
+        _cache_put(path, data)
+        return data if readonly else copy.deepcopy(data)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Invalid YAML file: {e}")
 
 
-def _save_yaml(path: Path, data: Dict[str, Any]):
-    # No backups, just overwrite in place
-    with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, sort_keys=False, allow_unicode=True)
+_SECTION_KEYS = ("id", "name", "position", "default_prompt", "enabled")
 
 
-def _find_section(data: Dict[str, Any], section_id: str) -> Dict[str, Any]:
-    sections: List[Dict[str, Any]] = data.get("sections", []) or []
+def _matches_prompts_schema(data: Dict[str, Any]) -> bool:
+    """True when data is exactly the fixed prompts.yaml shape we own."""
+    if not isinstance(data, dict) or set(data) - {"overarching", "sections"}:
+        return False
+    if not isinstance(data.get("overarching", ""), str):
+        return False
+    sections = data.get("sections", [])
+    if not isinstance(sections, list):
+        return False
     for s in sections:
-        if s.get("id") == section_id:
-            return s
-    raise HTTPException(
-        status_code=404,
-        detail=f"Section '{section_id}' not found",
-    )
+        if not isinstance(s, dict) or set(s) - set(_SECTION_KEYS):
+            return False
+        if not isinstance(s.get("id", ""), str) or not isinstance(s.get("name", ""), str):
+            return False
+        if not isinstance(s.get("default_prompt", ""), str):
+            return False
+        pos = s.get("position", 0)
+        if isinstance(pos, bool) or not isinstance(pos, int):
+            return False
+        if not isinstance(s.get("enabled", True), bool):
+            return False
+    return True
+
+
+def _emit_prompts(data: Dict[str, Any]) -> str:
+    """
+    Hand-emit YAML for the known prompts schema, skipping the PyYAML
+    emitter entirely. String scalars go out JSON-quoted, which is valid
+    YAML and handles every escape for us.
+    """
+    out: List[str] = []
+    if "overarching" in data:
+        out.append(f"overarching: {json.dumps(data['overarching'], ensure_ascii=False)}\n")
+    sections = data.get("sections")
+    if sections is not None:
+        if not sections:
+            out.append("sections: []\n")
+        else:
+            out.append("sections:\n")
+            for s in sections:
+                prefix = "- "
+                for k in _SECTION_KEYS:
+                    if k not in s:
+                        continue
+                    v = s[k]
+                    if isinstance(v, bool):
+                        sv = "true" if v else "false"
+                    elif isinstance(v, int):
+                        sv = str(v)
+                    else:
+                        sv = json.dumps(v, ensure_ascii=False)
+                    out.append(f"{prefix}{k}: {sv}\n")
+                    prefix = "  "
+    return "".join(out)
+
+
+def _save_prompts(path: Path, data: Dict[str, Any]) -> None:
+    """
+    Persist a mutation. prompts.json is the write path — a small atomic
+    JSON dump instead of a full YAML re-serialization per edit. The YAML
+    twin is only regenerated on demand via the export_yaml endpoint
+    (readers everywhere prefer the sidecar when it is fresher).
+    """
+    new_bytes = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    # UI auto-saves often resubmit identical content; skip the write (and
+    # its fsync) when nothing actually changed
+    try:
+        if _sidecar_path(path).read_bytes() == new_bytes:
+            _cache_put(path, copy.deepcopy(data))
+            return
+    except OSError:
+        pass
+    fd, tmp = tempfile.mkstemp(prefix=".prompts.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(new_bytes)
+        os.replace(tmp, _sidecar_path(path))
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # write-through so the next read skips the parse
+    _cache_put(path, copy.deepcopy(data))
+
+
+def _export_yaml(path: Path, data: Dict[str, Any]) -> None:
+    """Re-emit prompts.yaml from the current data, atomically."""
+    fd, tmp = tempfile.mkstemp(prefix=".prompts.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            if _matches_prompts_schema(data):
+                f.write(_emit_prompts(data))
+            else:
+                yaml.dump(data, f, Dumper=_YamlDumper, sort_keys=False, allow_unicode=True)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _section_index(sections: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """One {id: section} dict instead of a linear scan per lookup."""
+    return {s.get("id"): s for s in sections}
+
+
+def _find_section(data: Dict[str, Any], section_id: str) -> Dict[str, Any]:
+    sections: List[Dict[str, Any]] = data["sections"]
+    sec = _section_index(sections).get(section_id)
+    if sec is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Section '{section_id}' not found",
+        )
+    return sec
 
 
 # ---------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------
 
-@router.get("/{framework}")
-def get_prompts(framework: str):
+@router.get("/{framework}", response_class=ORJSONResponse)
+async def get_prompts(framework: str):
     """
     Return the entire prompts.yaml contents as JSON.
     """
     path = _prompts_path(framework)
-    return _load_yaml(path)
+    return await asyncio.to_thread(_load_yaml, path, readonly=True)
 
 
-@router.get("/{framework}/sections")
-def list_sections(framework: str):
+@router.get("/{framework}/sections", response_class=ORJSONResponse)
+async def list_sections(framework: str):
     """
     Return just the sections list for a framework.
     """
     path = _prompts_path(framework)
-    data = _load_yaml(path)
+    data = await asyncio.to_thread(_load_yaml, path, readonly=True)
     return {
         "framework": framework,
-        "sections": data.get("sections", []) or [],
+        "sections": data["sections"],
     }
 
 
 @router.patch("/{framework}/overarching")
-def update_overarching(framework: str, body: Dict[str, Any]):
+async def update_overarching(framework: str, body: Dict[str, Any]):
     """
     Update just the overarching prompt text.
     Body: { "overarching": "<new text>" }
     """
     path = _prompts_path(framework)
-    data = _load_yaml(path)
 
     new_text = body.get("overarching")
     if not isinstance(new_text, str):
@@ -91,13 +327,15 @@ def update_overarching(framework: str, body: Dict[str, Any]):
             detail="Missing or invalid 'overarching' field",
         )
 
-    data["overarching"] = new_text.strip()
-    _save_yaml(path, data)
+    async with await _fw_lock(framework):
+        data = await asyncio.to_thread(_load_yaml, path)
+        data["overarching"] = new_text.strip()
+        await asyncio.to_thread(_save_prompts, path, data)
     return {"status": "ok", "updated": "overarching"}
 
 
 @router.post("/{framework}/sections")
-def add_section(framework: str, body: Dict[str, Any]):
+async def add_section(framework: str, body: Dict[str, Any]):
     """
     Append a new section to prompts.yaml.
 
@@ -111,7 +349,6 @@ def add_section(framework: str, body: Dict[str, Any]):
     }
     """
     path = _prompts_path(framework)
-    data = _load_yaml(path)
 
     sid = body.get("id")
     name = body.get("name")
@@ -124,34 +361,40 @@ def add_section(framework: str, body: Dict[str, Any]):
     if not isinstance(position, int):
         raise HTTPException(status_code=400, detail="Missing or invalid 'position' (int required)")
 
-    sections: List[Dict[str, Any]] = data.get("sections", []) or []
-
-    # ensure no duplicate id
-    if any(s.get("id") == sid for s in sections):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Section id '{sid}' already exists",
-        )
-
-    new_section = {
-        "id": sid,
-        "name": name,
-        "position": position,
-        "default_prompt": body.get("default_prompt", "") or "",
-    }
-    # optional flag to support enabling/disabling
-    if "enabled" in body:
-        new_section["enabled"] = bool(body["enabled"])
-
-    sections.append(new_section)
-    data["sections"] = sections
-
-    _save_yaml(path, data)
+    async with await _fw_lock(framework):
+        data = await asyncio.to_thread(_load_yaml, path)
+        sections: List[Dict[str, Any]] = data["sections"]
+
+        # ensure no duplicate id
+        if any(s.get("id") == sid for s in sections):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Section id '{sid}' already exists",
+            )
+
+        new_section = {
+            "id": sid,
+            "name": name,
+            "position": position,
+            "default_prompt": body.get("default_prompt", "") or "",
+        }
+        # optional flag to support enabling/disabling
+        if "enabled" in body:
+            new_section["enabled"] = bool(body["enabled"])
+
+        # insert at the right spot so the list stays sorted by position and
+        # readers never have to re-sort
+        positions = [int(s.get("position", 0)) for s in sections]
+        idx = bisect.bisect_left(positions, position)
+        sections.insert(idx, new_section)
+        data["sections"] = sections
+
+        await asyncio.to_thread(_save_prompts, path, data)
     return {"status": "ok", "added": sid}
 
 
 @router.patch("/{framework}/sections/reorder")
-def reorder_sections(framework: str, body: Dict[str, Any]):
+async def reorder_sections(framework: str, body: Dict[str, Any]):
     """
     Bulk update 'position' across sections.
 
@@ -165,7 +408,6 @@ def reorder_sections(framework: str, body: Dict[str, Any]):
     }
     """
     path = _prompts_path(framework)
-    data = _load_yaml(path)
 
     positions = body.get("positions")
     if not isinstance(positions, list):
@@ -174,46 +416,49 @@ def reorder_sections(framework: str, body: Dict[str, Any]):
             detail="Body must contain 'positions': [ { 'id': str, 'position': int }, ... ]",
         )
 
-    pos_map: Dict[str, int] = {}
-    for item in positions:
-        if not isinstance(item, dict):
-            continue
-        sid = item.get("id")
-        pos = item.get("position")
-        if isinstance(sid, str) and isinstance(pos, int):
-            pos_map[sid] = pos
-
-    if not pos_map:
+    # Validate the whole batch with C-level all() passes instead of
+    # per-item isinstance chains inside an interpreter loop.
+    ids = [item.get("id") if isinstance(item, dict) else None for item in positions]
+    poses = [item.get("position") if isinstance(item, dict) else None for item in positions]
+    if (
+        not ids
+        or not all(isinstance(i, str) for i in ids)
+        or not all(isinstance(p, int) for p in poses)
+    ):
         raise HTTPException(
             status_code=400,
             detail="No valid 'id'/'position' pairs provided",
         )
-
-    sections: List[Dict[str, Any]] = data.get("sections", []) or []
-    updated_ids: List[str] = []
-
-    for s in sections:
-        sid = s.get("id")
-        if sid in pos_map:
-            s["position"] = pos_map[sid]
-            updated_ids.append(sid)
-
-    if not updated_ids:
-        raise HTTPException(
-            status_code=404,
-            detail="No matching sections found for provided ids",
-        )
-
-    # Optional: keep YAML in position order
-    sections.sort(key=lambda s: int(s.get("position", 0)))
-    data["sections"] = sections
-
-    _save_yaml(path, data)
+    pos_map: Dict[str, int] = dict(zip(ids, poses))
+
+    async with await _fw_lock(framework):
+        data = await asyncio.to_thread(_load_yaml, path)
+        sections: List[Dict[str, Any]] = data["sections"]
+        id_map = _section_index(sections)
+        updated_ids: List[str] = []
+
+        for sid, pos in pos_map.items():
+            sec = id_map.get(sid)
+            if sec is not None:
+                sec["position"] = pos
+                updated_ids.append(sid)
+
+        if not updated_ids:
+            raise HTTPException(
+                status_code=404,
+                detail="No matching sections found for provided ids",
+            )
+
+        # Keep YAML in position order; itemgetter avoids a Python frame per compare
+        sections.sort(key=operator.itemgetter("position"))
+        data["sections"] = sections
+
+        await asyncio.to_thread(_save_prompts, path, data)
     return {"status": "ok", "updated": updated_ids}
 
 
 @router.patch("/{framework}/sections/{section_id}")
-def update_section(framework: str, section_id: str, body: Dict[str, Any]):
+async def update_section(framework: str, section_id: str, body: Dict[str, Any]):
     """
     Edit one section (name, position, default_prompt, enabled, etc.).
 
@@ -228,48 +473,58 @@ def update_section(framework: str, section_id: str, body: Dict[str, Any]):
     Note: 'id' field in body is ignored (we don't allow changing the id here).
     """
     path = _prompts_path(framework)
-    data = _load_yaml(path)
-
-    sections: List[Dict[str, Any]] = data.get("sections", []) or []
 
     # don't allow changing the id via patch
     body = dict(body)
     body.pop("id", None)
 
-    for s in sections:
-        if s.get("id") == section_id:
-            # Validation for position if present
-            if "position" in body and not isinstance(body["position"], int):
-                raise HTTPException(
-                    status_code=400,
-                    detail="'position' must be an integer",
-                )
-            # simple update of allowed keys
-            for k, v in body.items():
-                if k in ("name", "position", "default_prompt", "enabled"):
-                    s[k] = v
-            _save_yaml(path, data)
-            return {"status": "ok", "updated": section_id}
-
-    raise HTTPException(status_code=404, detail=f"Section '{section_id}' not found")
+    # Validation for position if present
+    if "position" in body and not isinstance(body["position"], int):
+        raise HTTPException(
+            status_code=400,
+            detail="'position' must be an integer",
+        )
+
+    async with await _fw_lock(framework):
+        data = await asyncio.to_thread(_load_yaml, path)
+        s = _find_section(data, section_id)
+        # simple update of allowed keys
+        for k, v in body.items():
+            if k in ("name", "position", "default_prompt", "enabled"):
+                s[k] = v
+        await asyncio.to_thread(_save_prompts, path, data)
+    return {"status": "ok", "updated": section_id}
 
 
 @router.delete("/{framework}/sections/{section_id}")
-def delete_section(framework: str, section_id: str):
+async def delete_section(framework: str, section_id: str):
     """
     Remove one section from prompts.yaml.
     """
     path = _prompts_path(framework)
-    data = _load_yaml(path)
 
-    sections: List[Dict[str, Any]] = data.get("sections", []) or []
-    before = len(sections)
-    sections = [s for s in sections if s.get("id") != section_id]
-    after = len(sections)
+    async with await _fw_lock(framework):
+        data = await asyncio.to_thread(_load_yaml, path)
+        sections: List[Dict[str, Any]] = data["sections"]
+        if section_id not in _section_index(sections):
+            raise HTTPException(status_code=404, detail=f"Section '{section_id}' not found")
+
+        sections = [s for s in sections if s.get("id") != section_id]
+        data["sections"] = sections
+        await asyncio.to_thread(_save_prompts, path, data)
+    return {"status": "ok", "deleted": section_id, "remaining": len(sections)}
 
-    if before == after:
-        raise HTTPException(status_code=404, detail=f"Section '{section_id}' not found")
 
-    data["sections"] = sections
-    _save_yaml(path, data)
-    return {"status": "ok", "deleted": section_id, "remaining": after}
+@router.post("/{framework}/export_yaml")
+async def export_yaml(framework: str):
+    """
+    Regenerate prompts.yaml from the current (JSON-backed) prompt data.
+
+    Mutations only touch the fast JSON sidecar; this is the explicit
+    admin action that refreshes the human-readable YAML twin.
+    """
+    path = _prompts_path(framework)
+    async with await _fw_lock(framework):
+        data = await asyncio.to_thread(_load_yaml, path)
+        await asyncio.to_thread(_export_yaml, path, data)
+    return {"status": "ok", "framework": framework, "exported": "prompts.yaml"}
@@ -1,16 +1,19 @@
 from __future__ import annotations
 from fastapi import APIRouter, HTTPException
 from pathlib import Path
-import traceback
+import logging
 from typing import Any, Dict
 
 from engine.indexer import index_framework
 
 router = APIRouter(prefix="/index", tags=["index"])
+logger = logging.getLogger(__name__)
+
+_SRC_ROOT = Path(__file__).resolve().parents[2]
 
 def get_src_root() -> Path:
     # .../backend/src
-    return Path(__file__).resolve().parents[2]
+    return _SRC_ROOT
 
 @router.get("/health")
 def health() -> Dict[str, Any]:
@@ -24,5 +27,5 @@ def index_fw(framework: str):
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("framework indexing failed", extra={"framework": framework})
         raise HTTPException(status_code=500, detail=f"{type(e).__name__}: {e}")
@@ -1,64 +1,158 @@
 from __future__ import annotations
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
-import traceback
+import asyncio
+import logging
+import os
 
-from engine.indexer import index_assessment_pdf, index_evidence_file, index_evidence_batch
+import aiofiles
+
+from engine.indexer import index_assessment_pdf, index_evidence_file
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
+logger = logging.getLogger(__name__)
+
+# 1 MiB matches Starlette's SpooledTemporaryFile rollover size
+_UPLOAD_CHUNK = 1 << 20
+
+# cap on concurrent indexers for /evidence-batch; keeps embedding-model
+# memory bounded while still overlapping parse/embed work across files
+EVIDENCE_BATCH_SIZE = int(os.getenv("EVIDENCE_BATCH_SIZE", "8"))
+
+# resolved once: Path.resolve() stats every component on each call
+_UPLOADS_ROOT = Path(__file__).resolve().parents[2] / "data" / "uploads"
+_UPLOADS_ROOT.mkdir(parents=True, exist_ok=True)
 
 def _uploads_root() -> Path:
-    return Path(__file__).resolve().parents[2] / "data" / "uploads"
+    return _UPLOADS_ROOT
+
+# reject oversize uploads from the Content-Length header before a byte is
+# spooled; the raw endpoint also counts as it streams for chunked bodies
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500_000_000)))
 
-@router.post("/assessment")
+async def _enforce_max_size(request: Request) -> None:
+    try:
+        cl = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        cl = 0
+    if cl > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Upload too large")
+
+async def _save_upload(uf: UploadFile, dst: Path) -> None:
+    """Stream an upload to disk in chunks; never buffers the whole file."""
+    async with aiofiles.open(dst, "wb") as f:
+        while chunk := await uf.read(_UPLOAD_CHUNK):
+            await f.write(chunk)
+
+@router.post("/assessment", dependencies=[Depends(_enforce_max_size)])
 async def ingest_assessment(firm: str = Form(...), file: UploadFile = File(...)):
     try:
         root = _uploads_root()
-        root.mkdir(parents=True, exist_ok=True)
         dst = root / f"{firm}__{file.filename}"
-        with dst.open("wb") as f:
-            f.write(await file.read())
+        await _save_upload(file, dst)
         info = index_assessment_pdf(firm, dst)
         return {"doc_id": dst.name, **info}
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("ingest failed")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/evidence")
+@router.post("/evidence", dependencies=[Depends(_enforce_max_size)])
 async def ingest_evidence(firm: str = Form(...), file: UploadFile = File(...)):
     """Single-file evidence ingest (kept for backward compatibility)."""
     try:
         root = _uploads_root()
-        root.mkdir(parents=True, exist_ok=True)
         dst = root / f"{firm}__{file.filename}"
-        with dst.open("wb") as f:
-            f.write(await file.read())
+        await _save_upload(file, dst)
         info = index_evidence_file(firm, dst)
         return {"doc_id": dst.name, **info}
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("ingest failed")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/evidence_raw", dependencies=[Depends(_enforce_max_size)])
+async def ingest_evidence_raw(request: Request):
+    """
+    Raw-body evidence ingest for CLI/batch uploaders: the file goes in the
+    request body with metadata in headers (X-Firm, X-Filename). Skips the
+    multipart parse and Starlette's spool file, so bytes go network ->
+    destination in one pass instead of two.
+    """
+    firm = request.headers.get("x-firm")
+    filename = request.headers.get("x-filename")
+    if not firm or not filename:
+        raise HTTPException(status_code=400, detail="X-Firm and X-Filename headers are required")
+    try:
+        root = _uploads_root()
+        dst = root / f"{firm}__{Path(filename).name}"
+        received = 0
+        async with aiofiles.open(dst, "wb") as f:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+                await f.write(chunk)
+        info = await run_in_threadpool(index_evidence_file, firm, dst)
+        return {"doc_id": dst.name, **info}
+    except HTTPException:
+        # drop the partial file from an aborted oversize stream
+        dst.unlink(missing_ok=True)
+        raise
+    except Exception as e:
+        logger.exception("ingest failed")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/evidence-batch")
+
+@router.post("/evidence-batch", dependencies=[Depends(_enforce_max_size)])
 async def ingest_evidence_batch(firm: str = Form(...), files: List[UploadFile] = File(...)):
     """
     Multi-file evidence ingest. Accepts PDFs, TXT, DOCX, XLSX/CSV, and images (PNG/JPG/TIFF).
     """
     try:
         root = _uploads_root()
-        root.mkdir(parents=True, exist_ok=True)
 
-        saved_paths = []
-        for uf in files:
-            dst = root / f"{firm}__{uf.filename}"
-            with dst.open("wb") as f:
-                f.write(await uf.read())
-            saved_paths.append(dst)
+        # Pipeline: save file N+1 while file N is being parsed/embedded.
+        # A small queue backpressures the producer so saved-but-unindexed
+        # files can't pile up on disk faster than workers drain them.
+        n_workers = max(1, min(EVIDENCE_BATCH_SIZE, os.cpu_count() or 1, len(files)))
+        queue: "asyncio.Queue[Optional[Tuple[int, Path]]]" = asyncio.Queue(maxsize=4)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+
+        async def _producer() -> None:
+            try:
+                for i, uf in enumerate(files):
+                    dst = root / f"{firm}__{uf.filename}"
+                    await _save_upload(uf, dst)
+                    await queue.put((i, dst))
+            finally:
+                # always send the stop sentinels — if a save fails (e.g.
+                # client disconnect) the workers would otherwise block on
+                # queue.get() forever while gather propagates the error
+                for _ in range(n_workers):
+                    await queue.put(None)
+
+        async def _worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                i, dst = item
+                try:
+                    info = await run_in_threadpool(index_evidence_file, firm, dst)
+                    results[i] = {"file": dst.name, "chunks": info.get("count", 0), "status": "ok"}
+                except Exception as e:
+                    results[i] = {"file": dst.name, "chunks": 0, "status": "error", "error": str(e)}
+
+        await asyncio.gather(_producer(), *(_worker() for _ in range(n_workers)))
 
-        summary = index_evidence_batch(firm, saved_paths)
+        files_out = [r for r in results if r is not None]
         # shape: {"total_docs": int, "total_chunks": int, "files": [{file, chunks, status, error?}, ...]}
-        return summary
+        return {
+            "total_docs": len(files),
+            "total_chunks": sum(f["chunks"] for f in files_out),
+            "files": files_out,
+        }
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("ingest failed")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,14 +1,30 @@
 # backend/src/api/routes/reports.py
 from __future__ import annotations
-from typing import Dict, Any, List, Optional, Iterable
+from typing import Dict, Any, List, Mapping, Optional, Iterable, Tuple, Union
+import asyncio
+import copy
+import functools
+import hashlib
 import json
-import traceback
-import uuid
-
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, StreamingResponse
+import logging
+import multiprocessing
+import os
+import random
+import secrets
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Response
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import httpx
+import orjson
 
 from engine.orchestrator import (
     run_report,
@@ -17,9 +33,237 @@ from engine.orchestrator import (
     RUNS_DIR,
 )
 from engine.renderers.pdf_report import build_pdf
-from engine.prompt_store import get_sections, get_overarching
+from engine.prompt_store import get_sections, get_overarching, prompts_mtime_ns
 
 router = APIRouter(prefix="/reports", tags=["reports"])
+logger = logging.getLogger(__name__)
+
+# CPU-heavy work (report generation, PDF rendering) gets its own executor
+# sized to the cores, separate from Starlette's I/O threadpool, so a long
+# render can't head-of-line block cheap load_run/YAML requests.
+_CPU_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 2, thread_name_prefix="report-cpu")
+
+
+async def _run_cpu(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_CPU_POOL, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_cpu_pool() -> None:
+    _CPU_POOL.shutdown(wait=False)
+    global _PDF_POOL
+    if _PDF_POOL is not None:
+        _PDF_POOL.shutdown(wait=False)
+        _PDF_POOL = None
+
+
+# PDF rendering is pure CPU (reportlab font shaping, layout) and holds
+# the GIL for the whole build, so it gets a process pool: renders run in
+# true parallel and never stall request threads. Created on first render
+# rather than at import so CLI tools importing this module don't fork
+# workers. Arguments cross the process boundary, so renders go through
+# module-level functions with picklable args (dicts and Paths).
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _PDF_POOL
+    if _PDF_POOL is None:
+        # spawn, not fork: by first render this process already runs the
+        # event loop, the report-cpu thread pool, and the logging
+        # QueueListener thread, and forking a threaded process can
+        # deadlock children on inherited locks
+        _PDF_POOL = ProcessPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 2) // 2),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _PDF_POOL
+
+
+async def _run_pdf(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pdf_pool(), functools.partial(fn, *args))
+
+
+# Queued PDF renders: jobs run on the CPU pool off the request path and
+# clients poll /reports/{run_id}/pdf/status. In-process rather than a
+# Redis/broker queue — this deploys as a single API process, and get_pdf
+# already re-renders on demand, so a restart can't strand a run.
+_pdf_jobs: Dict[str, Dict[str, Any]] = {}
+
+
+# Content-addressed PDF cache: identical (sections, findings, framework,
+# firm) payloads hash to the same key, so re-downloads and frontend
+# re-submits of unchanged content skip the render entirely and reduce to
+# a hardlink. Pruned to a byte cap, oldest entries first.
+_PDF_CACHE_DIR = RUNS_DIR / "cache"
+_PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(2_000_000_000)))
+
+
+def _pdf_cache_key(data: Dict[str, Any]) -> str:
+    return hashlib.blake2b(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+def _prune_pdf_cache() -> None:
+    try:
+        entries = sorted(
+            (e for e in os.scandir(_PDF_CACHE_DIR) if e.is_file()),
+            key=lambda e: e.stat().st_mtime,
+        )
+        total = sum(e.stat().st_size for e in entries)
+        for e in entries:
+            if total <= _PDF_CACHE_MAX_BYTES:
+                break
+            total -= e.stat().st_size
+            os.unlink(e.path)
+    except OSError:
+        pass
+
+
+def _build_pdf_cached(data: Dict[str, Any], out_pdf: Path) -> None:
+    """
+    build_pdf behind the content cache; runs on the CPU pool. Renders at
+    most once per distinct payload, then links the cache entry into place.
+    """
+    cached = _PDF_CACHE_DIR / f"{_pdf_cache_key(data)}.pdf"
+    if cached.exists():
+        os.utime(cached)  # bump recency so pruning keeps hot entries
+    else:
+        _PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=_PDF_CACHE_DIR, suffix=".tmp")
+        os.close(fd)
+        try:
+            build_pdf(data, Path(tmp))
+            os.replace(tmp, cached)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        _prune_pdf_cache()
+    # publish atomically: link/copy to a temp name, then os.replace, so a
+    # concurrent GET never observes a missing or half-copied {run_id}.pdf
+    tmp_out = out_pdf.with_name(f".{out_pdf.name}.{os.getpid()}.tmp")
+    try:
+        os.link(cached, tmp_out)
+    except OSError:
+        shutil.copyfile(cached, tmp_out)
+    os.replace(tmp_out, out_pdf)
+
+
+async def _render_pdf_job(run_id: str, data: Dict[str, Any], out_pdf) -> None:
+    _pdf_jobs[run_id] = {"status": "rendering"}
+    try:
+        await _run_pdf(_build_pdf_cached, data, out_pdf)
+        _pdf_jobs[run_id] = {"status": "ready"}
+    except Exception as e:
+        logger.exception("queued PDF render failed for %s", run_id)
+        _pdf_jobs[run_id] = {"status": "error", "error": str(e)}
+
+
+# One pooled client for all webhook deliveries: keep-alive connections
+# amortize the TCP/TLS handshake across events instead of paying it per
+# background task. Created lazily, closed from the app shutdown hook.
+_WEBHOOK_BATCH = 32          # max events per delivery
+_WEBHOOK_FLUSH_SECS = 0.25   # max time an event waits in the buffer
+_STREAM_FLUSH_SECS = 0.25    # max time an NDJSON event waits in /run_stream's buffer
+_webhook_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_webhook_client() -> httpx.AsyncClient:
+    global _webhook_client
+    if _webhook_client is None or _webhook_client.is_closed:
+        _webhook_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _webhook_client
+
+
+async def close_webhook_client() -> None:
+    global _webhook_client
+    if _webhook_client is not None and not _webhook_client.is_closed:
+        await _webhook_client.aclose()
+    _webhook_client = None
+
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# Cap concurrent deliveries per receiver host so many simultaneous runs
+# pointed at one webhook can't monopolize the shared pool or hammer a
+# slow endpoint.
+_WEBHOOK_PER_HOST = int(os.getenv("WEBHOOK_PER_HOST_CONCURRENCY", "8"))
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    sem = _host_semaphores.get(host)
+    if sem is None:
+        sem = _host_semaphores.setdefault(host, asyncio.Semaphore(_WEBHOOK_PER_HOST))
+    return sem
+
+
+# Retry schedule for transient delivery failures (timeouts, 5xx):
+# capped exponential backoff with a little jitter so retries from
+# concurrent runs don't synchronize against a recovering receiver.
+_WEBHOOK_MAX_RETRIES = 3
+_WEBHOOK_BASE_DELAY = 0.5
+_WEBHOOK_MAX_DELAY = 30.0
+
+
+# Per-URL delivery counters surfaced on /reports/webhook/stats so a
+# misbehaving receiver is visible without grepping logs.
+_delivery_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _stats_for(url: str) -> Dict[str, float]:
+    return _delivery_stats.setdefault(
+        url, {"success": 0, "retries": 0, "drops": 0, "latency_ms_total": 0.0}
+    )
+
+
+async def _post_event(
+    client: httpx.AsyncClient, url: str, payload: Union[Dict[str, Any], bytes]
+) -> None:
+    # pre-encode with orjson; json= would route through stdlib json.dumps.
+    # bytes payloads are already-encoded JSON and pass through untouched.
+    body = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+    stats = _stats_for(url)
+    for attempt in range(_WEBHOOK_MAX_RETRIES + 1):
+        retry_after = None
+        try:
+            t0 = time.monotonic()
+            async with _host_semaphore(url):
+                r = await client.post(url, content=body, headers=_JSON_HEADERS)
+            # Ack contract: 2xx = consumed; 429/503 = back off and retry
+            # (honoring Retry-After); other 4xx = rejected, don't retry.
+            if r.is_success:
+                stats["success"] += 1
+                stats["latency_ms_total"] += (time.monotonic() - t0) * 1000.0
+                return
+            if r.status_code == 429 or r.status_code == 503:
+                try:
+                    retry_after = float(r.headers.get("retry-after", ""))
+                except ValueError:
+                    retry_after = None
+            elif r.status_code < 500:
+                logger.debug("webhook POST to %s rejected: HTTP %d", url, r.status_code)
+                stats["drops"] += 1
+                return
+        except httpx.HTTPError:
+            pass
+        if attempt < _WEBHOOK_MAX_RETRIES:
+            stats["retries"] += 1
+            if retry_after is None:
+                retry_after = min(_WEBHOOK_MAX_DELAY, _WEBHOOK_BASE_DELAY * 2 ** attempt)
+            await asyncio.sleep(
+                min(_WEBHOOK_MAX_DELAY, retry_after) + random.uniform(0, 0.25)
+            )
+    stats["drops"] += 1
+    logger.warning(
+        "webhook POST to %s dropped after %d attempts", url, _WEBHOOK_MAX_RETRIES + 1
+    )
 
 
 # ---------- Request Models ----------
@@ -60,23 +304,69 @@ class GeneratePdfRequest(BaseModel):
 
 
 # ---------- Helpers ----------
-def _resolve_sections(framework: str, selected_ids: List[str]) -> List[Dict[str, Any]]:
+@functools.lru_cache(maxsize=64)
+def _section_index(framework: str, mtime_ns: int) -> Mapping[str, Dict[str, Any]]:
     """
-    Returns only the selected sections (sorted by position),
-    raising if any id is unknown for the framework.
+    id -> section lookup built once per framework+prompts version and
+    shared across every selection of that framework; read-only so cached
+    selections can't mutate it.
+    """
+    return MappingProxyType({s["id"]: s for s in get_sections(framework)})
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_cached(
+    framework: str, selected_ids: Tuple[str, ...], mtime_ns: int
+) -> Tuple[Tuple[Dict[str, Any], ...], str]:
     """
-    all_sections = get_sections(framework)  # [{id, name, position, default_prompt}, ...]
-    index = {s["id"]: s for s in all_sections}
-    result: List[Dict[str, Any]] = []
+    Resolve (selected sections sorted by position, overarching prompt) once
+    per (framework, selection, prompts mtime); the webhook path otherwise
+    repeats this work twice per request. mtime_ns invalidates on file edits.
+    """
+    index = _section_index(framework, mtime_ns)
     for sid in selected_ids:
         if sid not in index:
             raise KeyError(f"Unknown section id for framework '{framework}': {sid}")
-        result.append(index[sid])
-    result.sort(key=lambda s: int(s.get("position", 0)))
-    return result
+    # prompt_store presorts by position, and dicts preserve insertion
+    # order, so filtering the index keeps sections sorted — no re-sort
+    id_set = set(selected_ids)
+    result = tuple(s for s in index.values() if s["id"] in id_set)
+    return result, get_overarching(framework)
+
+
+def _resolve_run_inputs(framework: str, selected_ids: List[str]) -> Tuple[List[Dict[str, Any]], str]:
+    sections, overarching = _resolve_cached(
+        framework, tuple(selected_ids), prompts_mtime_ns(framework)
+    )
+    # deepcopy so downstream prompt_overrides can't mutate the cached dicts
+    return copy.deepcopy(list(sections)), overarching
+
+
+def _resolve_sections(framework: str, selected_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Returns only the selected sections (sorted by position),
+    raising if any id is unknown for the framework.
+    """
+    return _resolve_run_inputs(framework, selected_ids)[0]
+
+
+def _bake_prompts(
+    sections: List[Dict[str, Any]], overrides: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """
+    Merge prompt_overrides into each section's default_prompt up front, so
+    the orchestrator (and the webhook background task) never re-consult the
+    overrides dict per section. Sections are request-local copies.
+    """
+    if overrides:
+        for s in sections:
+            ov = overrides.get(s.get("id"))
+            if ov:
+                s["default_prompt"] = ov
+    return sections
 
 
-def _run_stream_to_webhook(
+async def _run_stream_to_webhook(
     req: RunReportRequest,
     selected_sections: List[Dict[str, Any]],
     overarching: str,
@@ -96,6 +386,7 @@ def _run_stream_to_webhook(
 
     # Seed with pre-generated run_id so every event can be correlated
     run_id_seen: Optional[str] = pre_run_id
+    client = _get_webhook_client()
 
     try:
         stream: Iterable[str] = run_report_stream(
@@ -103,7 +394,7 @@ def _run_stream_to_webhook(
             firm=req.firm,
             scope=req.scope,
             selected_sections=selected_sections,
-            prompt_overrides=req.prompt_overrides or {},
+            prompt_overrides={},  # already baked into default_prompt
             overarching_prompt=overarching,
             include_rag_debug=req.include_rag_debug,
             provider=req.provider,
@@ -112,77 +403,107 @@ def _run_stream_to_webhook(
             run_id=pre_run_id,
         )
 
-        with httpx.Client(timeout=10.0) as client:
-            for line in stream:
-                line = (line or "").strip()
-                if not line:
-                    continue
-
-                try:
-                    evt = json.loads(line)
-                except Exception:
-                    # if the line isn't valid JSON, just log and skip
-                    print(f"[run_stream_to_webhook] Failed to parse line: {line!r}")
-                    continue
-
-                if evt.get("run_id"):
-                    run_id_seen = evt["run_id"]
-
-                payload = {
-                    **evt,
-                    "run_id": evt.get("run_id") or run_id_seen,
-                    "framework": req.framework,
-                    "firm": req.firm,
-                }
-
-                try:
-                    client.post(webhook_url, json=payload)
-                except Exception as post_err:
-                    print(f"[run_stream_to_webhook] Webhook POST error: {post_err}")
-
-            # Final notification: tell consumer that PDF is ready to be downloaded
-            # via GET /reports/{run_id}/pdf
-            if run_id_seen:
-                try:
-                    final_payload = {
-                        "event": "pdf_ready",
-                        "run_id": run_id_seen,
-                        "framework": req.framework,
-                        "firm": req.firm,
-                    }
-                    client.post(webhook_url, json=final_payload)
-                except Exception as send_err:
-                    print(f"[run_stream_to_webhook] Error sending final pdf_ready event: {send_err}")
+        # Coalesce events into array batches: one POST per 32 events or
+        # 250 ms, whichever comes first, instead of one round-trip per
+        # tiny event. Receivers get {"events": [...]} in stream order.
+        #
+        # Frames pass through as the bytes the orchestrator encoded: the
+        # framework/firm wrapper fields are byte-spliced onto each frame
+        # and batches are assembled by joining frames, so event payloads
+        # (which carry full section texts) are never parsed and
+        # re-serialized on the delivery path.
+        suffix = (
+            b',"framework":' + orjson.dumps(req.framework)
+            + b',"firm":' + orjson.dumps(req.firm) + b"}"
+        )
+        run_id_field = b'"run_id":' + orjson.dumps(pre_run_id) + b","
+        pending: List[bytes] = []
+        last_flush = time.monotonic()
+
+        async def _flush() -> None:
+            nonlocal last_flush
+            if pending:
+                await _post_event(
+                    client, webhook_url, b'{"events":[' + b",".join(pending) + b"]}"
+                )
+                pending.clear()
+            last_flush = time.monotonic()
+
+        async for line in iterate_in_threadpool(stream):
+            line = (line or b"").strip()
+            if not (line.startswith(b"{") and line.endswith(b"}")):
+                if line:
+                    logger.debug("skipping malformed stream line: %r", line[:200])
+                continue
+
+            frame = line[:-1]
+            if b'"run_id"' not in frame:
+                # the orchestrator stamps run_id on every event, but guard
+                # against custom streams that don't
+                frame = b"{" + run_id_field + frame[1:]
+            pending.append(frame + suffix)
+            if (
+                len(pending) >= _WEBHOOK_BATCH
+                or time.monotonic() - last_flush > _WEBHOOK_FLUSH_SECS
+            ):
+                await _flush()
+
+        await _flush()
+
+        # Final notification: tell consumer that PDF is ready to be downloaded
+        # via GET /reports/{run_id}/pdf
+        if run_id_seen:
+            await _post_event(client, webhook_url, {"events": [{
+                "event": "pdf_ready",
+                "run_id": run_id_seen,
+                "framework": req.framework,
+                "firm": req.firm,
+            }]})
 
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("webhook report run failed", extra={"framework": req.framework, "firm": req.firm})
         # Best-effort failure notification to the webhook
-        try:
-            if webhook_url:
-                with httpx.Client(timeout=10.0) as client:
-                    client.post(
-                        webhook_url,
-                        json={
-                            "event": "report_failed",
-                            "framework": req.framework,
-                            "firm": req.firm,
-                            "error": str(e),
-                            "run_id": run_id_seen,
-                        },
-                    )
-        except Exception as post_err:
-            print(f"[run_stream_to_webhook] Error sending failure event: {post_err}")
+        await _post_event(client, webhook_url, {"events": [{
+            "event": "report_failed",
+            "framework": req.framework,
+            "firm": req.firm,
+            "error": str(e),
+            "run_id": run_id_seen,
+        }]})
 
 
 # ---------- Routes ----------
+@router.get("/webhook/stats")
+async def webhook_stats():
+    """
+    Delivery counters per webhook URL: successful POSTs, retries, drops,
+    and mean delivery latency. In-process numbers; reset on restart.
+    """
+    out = {}
+    for url, s in _delivery_stats.items():
+        out[url] = {
+            "success": int(s["success"]),
+            "retries": int(s["retries"]),
+            "drops": int(s["drops"]),
+            "avg_latency_ms": (
+                round(s["latency_ms_total"] / s["success"], 2) if s["success"] else None
+            ),
+        }
+    return out
+
+
+
 @router.get("/sections/{framework}")
-def list_sections(framework: str):
+async def list_sections(framework: str):
     """
     UI uses this to populate the section list + default prompts + overarching prompt.
     """
     try:
-        sections = get_sections(framework)
-        over = get_overarching(framework)
+        # one threadpool hop; both reads hit the same mtime-keyed cache in
+        # prompt_store, so the second costs a dict lookup, not a YAML parse
+        sections, over = await run_in_threadpool(
+            lambda: (get_sections(framework), get_overarching(framework))
+        )
         return {
             "framework": framework,
             "overarching_prompt": over,
@@ -193,35 +514,42 @@ def list_sections(framework: str):
 
 
 @router.post("/run")
-def run(req: RunReportRequest):
+async def run(req: RunReportRequest):
     """
     Non-streaming run that returns the full result after generation completes.
     """
     try:
-        selected_sections = _resolve_sections(req.framework, req.selected_section_ids)
+        selected_sections, yaml_overarching = _resolve_run_inputs(
+            req.framework, req.selected_section_ids
+        )
+        selected_sections = _bake_prompts(selected_sections, req.prompt_overrides or {})
         # UI override wins, else YAML value (from prompt_store)
-        overarching = (req.overarching_prompt or "").strip() or get_overarching(req.framework)
+        overarching = (req.overarching_prompt or "").strip() or yaml_overarching
 
-        result = run_report(
+        result = await _run_cpu(
+            run_report,
             req.framework,
             req.firm,
             req.scope,
             provider=req.provider,
             model=req.model,
             selected_sections=selected_sections,
-            prompt_overrides=req.prompt_overrides or {},
+            prompt_overrides={},  # already baked into default_prompt
             overarching_prompt=overarching,
             include_rag_debug=req.include_rag_debug,
             retrieval_strategy=req.retrieval_strategy,
         )
-        return {"run_id": result["run_id"], "result": result}
+        # result is orchestrator-produced plain JSON; returning the
+        # response directly skips FastAPI's jsonable_encoder pass, which
+        # otherwise re-walks every section string in the payload
+        return ORJSONResponse({"run_id": result["run_id"], "result": result})
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("/reports/run failed", extra={"framework": req.framework, "firm": req.firm})
         raise HTTPException(status_code=500, detail=f"/reports/run error: {str(e)}")
 
 
 @router.post("/run_stream")
-def run_stream(req: RunReportRequest, background_tasks: BackgroundTasks):
+async def run_stream(req: RunReportRequest, background_tasks: BackgroundTasks):
     """
     Two modes:
 
@@ -235,13 +563,16 @@ def run_stream(req: RunReportRequest, background_tasks: BackgroundTasks):
          { "status": "started", "webhook": true, "run_id": "...", ... }
     """
     # Pre-generate a run_id for correlation (especially for webhook mode)
-    pre_run_id = f"{req.framework}-{req.firm}-{uuid.uuid4().hex[:12]}"
+    pre_run_id = f"{req.framework}-{req.firm}-{secrets.token_hex(6)}"
 
     # If a webhook URL is provided, use background webhook mode
     if req.webhook_url:
         try:
-            selected_sections = _resolve_sections(req.framework, req.selected_section_ids)
-            overarching = (req.overarching_prompt or "").strip() or get_overarching(req.framework)
+            selected_sections, yaml_overarching = _resolve_run_inputs(
+                req.framework, req.selected_section_ids
+            )
+            selected_sections = _bake_prompts(selected_sections, req.prompt_overrides or {})
+            overarching = (req.overarching_prompt or "").strip() or yaml_overarching
 
             background_tasks.add_task(
                 _run_stream_to_webhook,
@@ -258,42 +589,156 @@ def run_stream(req: RunReportRequest, background_tasks: BackgroundTasks):
                 "run_id": pre_run_id,
             }
         except Exception as e:
-            traceback.print_exc()
+            logger.exception("report stream failed")
             raise HTTPException(status_code=500, detail=f"/reports/run_stream webhook error: {str(e)}")
 
-    # Otherwise, keep the original NDJSON streaming behavior
-    def _gen():
+    # Otherwise, keep the original NDJSON streaming behavior. The report
+    # stream itself is a sync generator; iterate_in_threadpool runs each
+    # blocking next() on a worker thread so the event loop stays free for
+    # other requests between token batches.
+    async def _gen():
         try:
-            selected_sections = _resolve_sections(req.framework, req.selected_section_ids)
-            overarching = (req.overarching_prompt or "").strip() or get_overarching(req.framework)
+            selected_sections, yaml_overarching = _resolve_run_inputs(
+                req.framework, req.selected_section_ids
+            )
+            selected_sections = _bake_prompts(selected_sections, req.prompt_overrides or {})
+            overarching = (req.overarching_prompt or "").strip() or yaml_overarching
 
             stream = run_report_stream(
                 framework=req.framework,
                 firm=req.firm,
                 scope=req.scope,
                 selected_sections=selected_sections,
-                prompt_overrides=req.prompt_overrides or {},
+                prompt_overrides={},  # already baked into default_prompt
                 overarching_prompt=overarching,
                 include_rag_debug=req.include_rag_debug,
                 provider=req.provider,
                 model=req.model,
                 retrieval_strategy=req.retrieval_strategy,
             )
-            for line in stream:
-                # 'line' is already a JSON-encoded string with trailing "\n"
-                yield line
+            # Coalesce tiny events into fewer, larger transfer chunks; each
+            # yield is a chunked-transfer frame with its own syscall. Flush
+            # on section boundaries, on size, and on a short timer — the
+            # timer is what gets ~150-byte section_delta frames out at
+            # token latency instead of in 16 KiB bursts (same 0.25 s bound
+            # the webhook batcher uses).
+            buf = bytearray()
+            last_flush = time.monotonic()
+            async for line in iterate_in_threadpool(stream):
+                # 'line' is already orjson-encoded bytes with trailing b"\n"
+                chunk = line if isinstance(line, bytes) else line.encode("utf-8")
+                buf += chunk
+                now = time.monotonic()
+                if (
+                    len(buf) >= 16384
+                    or now - last_flush >= _STREAM_FLUSH_SECS
+                    or b'"section_text"' in chunk
+                    or b'"end"' in chunk
+                ):
+                    yield bytes(buf)
+                    buf.clear()
+                    last_flush = now
+            if buf:
+                yield bytes(buf)
         except Exception as e:
-            traceback.print_exc()
-            yield json.dumps({"event": "error", "message": str(e)}) + "\n"
+            logger.exception("report stream failed")
+            yield orjson.dumps({"event": "error", "message": str(e)}) + b"\n"
+
+    return StreamingResponse(
+        _gen(),
+        media_type="application/x-ndjson",
+        # nginx and friends buffer responses by default, which would undo
+        # the incremental delivery the stream exists for
+        headers={"X-Accel-Buffering": "no"},
+    )
 
-    return StreamingResponse(_gen(), media_type="application/x-ndjson")
+
+_SSE_HEARTBEAT_SECS = 15.0
+
+
+@router.post("/run_stream_sse")
+async def run_stream_sse(req: RunReportRequest):
+    """
+    SSE variant of /run_stream for clients behind proxies that kill idle
+    connections: each NDJSON event becomes a `data:` frame, and an SSE
+    comment heartbeat goes out whenever the LLM pauses longer than 15 s
+    so Cloudflare/nginx idle timeouts never fire mid-run. POST rather
+    than the usual SSE GET because the run configuration rides in the
+    request body, same as /run_stream.
+    """
+    async def _sse():
+        try:
+            selected_sections, yaml_overarching = _resolve_run_inputs(
+                req.framework, req.selected_section_ids
+            )
+            selected_sections = _bake_prompts(selected_sections, req.prompt_overrides or {})
+            overarching = (req.overarching_prompt or "").strip() or yaml_overarching
+
+            stream = run_report_stream(
+                framework=req.framework,
+                firm=req.firm,
+                scope=req.scope,
+                selected_sections=selected_sections,
+                prompt_overrides={},  # already baked into default_prompt
+                overarching_prompt=overarching,
+                include_rag_debug=req.include_rag_debug,
+                provider=req.provider,
+                model=req.model,
+                retrieval_strategy=req.retrieval_strategy,
+            )
+
+            # Pump events through a queue so heartbeat timeouts cancel a
+            # queue.get (safe) rather than the threadpool next() (which
+            # would drop the in-flight event).
+            queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=64)
+            pump_error: List[BaseException] = []
+
+            async def _pump() -> None:
+                try:
+                    async for line in iterate_in_threadpool(stream):
+                        await queue.put(line)
+                except BaseException as e:
+                    pump_error.append(e)
+                finally:
+                    await queue.put(None)
+
+            pump = asyncio.get_running_loop().create_task(_pump())
+            try:
+                while True:
+                    try:
+                        line = await asyncio.wait_for(
+                            queue.get(), timeout=_SSE_HEARTBEAT_SECS
+                        )
+                    except asyncio.TimeoutError:
+                        yield b": keep-alive\n\n"
+                        continue
+                    if line is None:
+                        break
+                    yield b"data: " + line.rstrip(b"\n") + b"\n\n"
+            finally:
+                pump.cancel()
+            if pump_error:
+                raise pump_error[0]
+        except Exception as e:
+            logger.exception("report SSE stream failed")
+            yield b"data: " + orjson.dumps({"event": "error", "message": str(e)}) + b"\n\n"
+
+    return StreamingResponse(
+        _sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/render_pdf")
-def render_pdf(req: GeneratePdfRequest):
+async def render_pdf(req: GeneratePdfRequest, wait: bool = True):
     """
     Given final edited content from the frontend, generate a PDF and return it.
 
+    With ?wait=false the render is queued instead: the response is a 202
+    with a poll URL, and the PDF is fetched from /reports/{run_id}/pdf
+    once /reports/{run_id}/pdf/status reports "ready".
+
     The structure matches what build_pdf already expects from a run:
       {
         "run_id": ...,
@@ -305,7 +750,7 @@ def render_pdf(req: GeneratePdfRequest):
       }
     """
     try:
-        run_id = req.run_id or f"{req.framework}-{req.firm}-manual-{uuid.uuid4().hex[:8]}"
+        run_id = req.run_id or f"{req.framework}-{req.firm}-manual-{secrets.token_hex(4)}"
 
         data: Dict[str, Any] = {
             "run_id": run_id,
@@ -321,46 +766,116 @@ def render_pdf(req: GeneratePdfRequest):
         RUNS_DIR.mkdir(parents=True, exist_ok=True)
         out_pdf = RUNS_DIR / f"{run_id}.pdf"
 
-        build_pdf(data, out_pdf)
+        if not wait:
+            _pdf_jobs[run_id] = {"status": "queued"}
+            asyncio.get_running_loop().create_task(
+                _render_pdf_job(run_id, data, out_pdf)
+            )
+            return ORJSONResponse(
+                status_code=202,
+                content={
+                    "status": "queued",
+                    "run_id": run_id,
+                    "poll": f"/reports/{run_id}/pdf/status",
+                },
+            )
+
+        await _run_pdf(_build_pdf_cached, data, out_pdf)
 
+        # stat off the loop; with stat_result supplied Starlette skips its
+        # own stat and streams via the zero-copy sendfile path
+        st = await run_in_threadpool(os.stat, out_pdf)
         return FileResponse(
             str(out_pdf),
             media_type="application/pdf",
             filename=f"{run_id}.pdf",
+            stat_result=st,
         )
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("/reports/render_pdf failed")
         raise HTTPException(status_code=500, detail=f"/reports/render_pdf error: {str(e)}")
 
 
 @router.get("/{run_id}")
-def get_run(run_id: str):
+async def get_run(run_id: str):
     try:
-        return load_run(run_id)
+        # load_run output is already plain JSON; skip the encoder walk
+        return ORJSONResponse(await run_in_threadpool(load_run, run_id))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/{run_id}/pdf/status")
+async def get_pdf_status(run_id: str):
+    """
+    Poll target for queued renders. Falls back to checking the filesystem
+    so status also works for PDFs rendered before the process restarted.
+    """
+    job = _pdf_jobs.get(run_id)
+    if job is not None:
+        return {"run_id": run_id, **job}
+    exists = await run_in_threadpool((RUNS_DIR / f"{run_id}.pdf").exists)
+    return {"run_id": run_id, "status": "ready" if exists else "unknown"}
+
+
 @router.get("/{run_id}/pdf")
-def get_pdf(run_id: str):
+async def get_pdf(run_id: str, request: Request):
     try:
-        data = load_run(run_id)
         out_pdf = RUNS_DIR / f"{run_id}.pdf"
-        build_pdf(data, out_pdf)
+        run_json = RUNS_DIR / f"{run_id}.json"
+
+        # Reuse the rendered PDF when it's at least as new as the run data;
+        # only the first download pays for the render, off the event loop.
+        def _stat_pair():
+            try:
+                st = os.stat(out_pdf)
+            except OSError:
+                return None, False
+            try:
+                return st, st.st_mtime >= os.stat(run_json).st_mtime
+            except OSError:
+                # manual renders (render_pdf without a run_id) produce a
+                # PDF with no run JSON; the PDF is the only artifact, so
+                # it's servable as-is — falling through to load_run would
+                # 500 the download URL that render_pdf itself advertised
+                return st, True
+
+        pdf_stat, fresh = await run_in_threadpool(_stat_pair)
+        if not fresh:
+            data = await run_in_threadpool(load_run, run_id)
+            await _run_pdf(_build_pdf_cached, data, out_pdf)
+            pdf_stat = await run_in_threadpool(os.stat, out_pdf)
+
+        # The PDF is NOT immutable — render_pdf overwrites it with edited
+        # content for the same run_id — so the validator comes from the
+        # served file's identity, checked only after the stat/render above.
+        etag = f'"{pdf_stat.st_mtime_ns:x}-{pdf_stat.st_size:x}"'
+        cache_headers = {
+            "ETag": etag,
+            "Cache-Control": "private, max-age=3600",
+        }
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+
         return FileResponse(
             str(out_pdf),
             media_type="application/pdf",
-            filename=f"{run_id}.pdf"
+            filename=f"{run_id}.pdf",
+            stat_result=pdf_stat,
+            headers={
+                **cache_headers,
+                "Content-Disposition": f'attachment; filename="{run_id}.pdf"',
+            },
         )
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("/reports/%s/pdf failed", run_id)
         raise HTTPException(status_code=500, detail=f"/reports/{run_id}/pdf error: {str(e)}")
 
 
 @router.get("/{run_id}/rag_debug")
-def get_rag_debug(run_id: str):
+async def get_rag_debug(run_id: str):
     try:
-        data = load_run(run_id)
-        return data.get("rag_debug", {})
+        data = await run_in_threadpool(load_run, run_id)
+        return ORJSONResponse(data.get("rag_debug", {}))
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
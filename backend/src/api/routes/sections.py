@@ -1,8 +1,9 @@
 from __future__ import annotations
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import List
 from engine.prompt_store import load_prompts
+from models.sections import SectionListAdapter
 
 from engine.sections_store import (
     load_sections, upsert_sections, delete_section, seed_defaults
@@ -30,7 +31,13 @@ def list_sections(framework: str):
 def upsert(body: UpsertBody):
     if not body.sections:
         raise HTTPException(status_code=400, detail="sections cannot be empty")
-    out = upsert_sections(body.framework, body.sections)
+    # the precompiled adapter validates the raw dicts once here instead of
+    # letting malformed rows surface as KeyErrors inside the store
+    try:
+        sections = SectionListAdapter.validate_python(body.sections)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    out = upsert_sections(body.framework, [s.model_dump() for s in sections])
     return {"framework": body.framework, "sections": [s.__dict__ for s in out]}
 
 @router.delete("/{framework}/{section_id}")
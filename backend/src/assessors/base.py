@@ -1,19 +1,72 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import functools
 import os
 import json
+import tempfile
+
+import yaml
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader  # libyaml, ~10x faster
+except ImportError:
+    from yaml import SafeLoader as _YamlSafeLoader
 
 # vector search wrapper you already have
-from services.vector_langchain import query as vs_query
+from services.vector_langchain import query as vs_query, query_batch as vs_query_batch
 
 @dataclass
 class BuildContext:
     firm: str
     scope: Optional[str] = None
 
+
+# Parsed taxonomies keyed by path, shared across assessor instances;
+# the mtime stamp invalidates entries when a taxonomy file is edited.
+_TAX_CACHE: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+# Micro-requirements flattened to parallel tuples (struct-of-arrays),
+# built once per taxonomy version; build_findings iterates these instead
+# of constructing a dict per requirement on every run. "query" is the
+# prompt with synonyms pre-joined — the string actually sent to the
+# vector store.
+_SOA_CACHE: Dict[Path, Tuple[int, Dict[str, tuple]]] = {}
+
+
+@functools.lru_cache(maxsize=4)
+def _openai_client(api_key: str):
+    # shared across render_section_text calls so the connection pool (and
+    # its TLS sessions) stays warm between sections
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+def _load_yaml_with_sidecar(p: Path, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Load a YAML taxonomy, preferring a .cache.json sidecar when it's at
+    least as fresh — json.loads is roughly an order of magnitude faster
+    than a YAML parse of the same content. The sidecar is (re)written
+    after a YAML parse, atomically and best-effort.
+    """
+    sidecar = p.with_suffix(".cache.json")
+    try:
+        if sidecar.stat().st_mtime_ns >= mtime_ns:
+            return json.loads(sidecar.read_text(encoding="utf-8")) or {}
+    except (OSError, ValueError):
+        pass
+    data = yaml.load(p.read_text(encoding="utf-8"), Loader=_YamlSafeLoader) or {}
+    try:
+        fd, tmp = tempfile.mkstemp(dir=str(p.parent), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, sidecar)
+    except OSError:
+        pass
+    return data
+
 class BaseFrameworkAssessor:
     """
     Base class that:
@@ -39,10 +92,43 @@ class BaseFrameworkAssessor:
         p = self.taxonomy_path()
         if not p.exists():
             raise FileNotFoundError(f"taxonomy not found: {p}")
+        mtime_ns = p.stat().st_mtime_ns
+        cached = _TAX_CACHE.get(p)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
         if p.suffix.lower() in [".yaml", ".yml"]:
-            import yaml
-            return yaml.safe_load(p.read_text(encoding="utf-8")) or {}
-        return json.loads(p.read_text(encoding="utf-8")) or {}
+            data = _load_yaml_with_sidecar(p, mtime_ns)
+        else:
+            data = json.loads(p.read_text(encoding="utf-8")) or {}
+        _TAX_CACHE[p] = (mtime_ns, data)
+        return data
+
+    def _controls_soa(self) -> Dict[str, tuple]:
+        p = self.taxonomy_path()
+        tax = self._load_taxonomy()
+        mtime_ns = p.stat().st_mtime_ns
+        cached = _SOA_CACHE.get(p)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        control_ids, control_names, mr_ids, prompts, queries = [], [], [], [], []
+        for ctrl in tax.get("controls") or tax.get("requirements") or []:
+            for mr in ctrl.get("micro_requirements") or []:
+                prompt = mr.get("prompt", "")
+                syns = mr.get("synonyms") or []
+                control_ids.append(ctrl.get("id"))
+                control_names.append(ctrl.get("name", ""))
+                mr_ids.append(mr.get("id"))
+                prompts.append(prompt)
+                queries.append(prompt + (" | " + " | ".join(syns) if syns else ""))
+        soa = {
+            "control_id": tuple(control_ids),
+            "control_name": tuple(control_names),
+            "mr_id": tuple(mr_ids),
+            "prompt": tuple(prompts),
+            "query": tuple(queries),
+        }
+        _SOA_CACHE[p] = (mtime_ns, soa)
+        return soa
 
     def _iter_controls(self) -> Iterable[Dict[str, Any]]:
         tax = getattr(self, "_taxonomy", None)
@@ -82,6 +168,14 @@ class BaseFrameworkAssessor:
         except Exception:
             return []
 
+    def _search_batch(
+        self, collection: str, texts: List[str], k: int = 4
+    ) -> List[List[Dict[str, Any]]]:
+        try:
+            return vs_query_batch(collection, texts, k)
+        except Exception:
+            return [[] for _ in texts]
+
     # --------- core RAG logic ---------
     def build_findings(self, ctx: BuildContext) -> List[Dict[str, Any]]:
         """
@@ -93,18 +187,26 @@ class BaseFrameworkAssessor:
         assess_col = self._col_assessment(ctx.firm)
         evid_col = self._col_evidence(ctx.firm)
 
-        findings: List[Dict[str, Any]] = []
-        for item in self._iter_controls():
-            q = item["prompt"]
-            if item.get("synonyms"):
-                q += " | " + " | ".join(item["synonyms"])
+        # one batched query per collection instead of three store
+        # round-trips per micro-requirement; the query strings come
+        # pre-joined from the taxonomy-version-scoped SoA cache
+        soa = self._controls_soa()
+        queries = list(soa["query"])
 
-            hits_fw = self._search(fw_col, q, k=3)
-            hits_assess = self._search(assess_col, q, k=4)
-            hits_evid = self._search(evid_col, q, k=6)
+        fw_hits = self._search_batch(fw_col, queries, k=3)
+        assess_hits = self._search_batch(assess_col, queries, k=4)
+        evid_hits = self._search_batch(evid_col, queries, k=6)
 
+        findings: List[Dict[str, Any]] = []
+        for i, (hits_fw, hits_assess, hits_evid) in enumerate(
+            zip(fw_hits, assess_hits, evid_hits)
+        ):
             ev_links = []
-            for h in (hits_assess + hits_evid):
+            # chain avoids a throwaway concatenated list per requirement,
+            # and only the first 6 links are ever kept
+            for h in chain(hits_assess, hits_evid):
+                if len(ev_links) >= 6:
+                    break
                 md = h.get("metadata") or {}
                 ev_links.append({
                     "doc_id": md.get("doc_id") or md.get("source_pdf") or md.get("file", ""),
@@ -116,19 +218,19 @@ class BaseFrameworkAssessor:
             confidence = 0.75 if ev_links else 0.2
 
             findings.append({
-                "id": f"{item['control_id']}.{item['mr_id']}",
-                "control_id": item["control_id"],
-                "control_name": item["control_name"],
-                "micro_requirement_id": item["mr_id"],
-                "claim": item["prompt"],
+                "id": f"{soa['control_id'][i]}.{soa['mr_id'][i]}",
+                "control_id": soa["control_id"][i],
+                "control_name": soa["control_name"][i],
+                "micro_requirement_id": soa["mr_id"][i],
+                "claim": soa["prompt"][i],
                 "assessment": assessment,
                 "confidence": confidence,
-                "framework_refs": [f"[{self.name}] control {item['control_id']}"] + (
+                "framework_refs": [f"[{self.name}] control {soa['control_id'][i]}"] + (
                     ["[guideline context present]"] if hits_fw else []
                 ),
                 "rationale": "Evidence retrieved that aligns with the control intent." if ev_links else
                              "No clear evidence retrieved.",
-                "evidence_links": ev_links[:6],
+                "evidence_links": ev_links,
             })
 
         return findings
@@ -150,12 +252,29 @@ class BaseFrameworkAssessor:
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key:
             try:
-                from openai import OpenAI
-                client = OpenAI(api_key=api_key)
-                # Construct compact context
-                brief = []
-                for f in findings[:20]:
-                    brief.append(f"- {f['id']}: {f['assessment']} (conf {int(f['confidence']*100)}%) :: {f['claim']}")
+                client = _openai_client(api_key)
+                # Construct compact context. Small sets go in verbatim;
+                # large sets are aggregated to counts plus the gaps that
+                # need follow-up, instead of silently truncating to the
+                # first 20 findings — fewer input tokens and no blind spot.
+                if len(findings) <= 20:
+                    brief = [
+                        f"- {f['id']}: {f['assessment']} (conf {int(f['confidence']*100)}%) :: {f['claim']}"
+                        for f in findings
+                    ]
+                else:
+                    meets = [f for f in findings if f["assessment"].lower() == "meets"]
+                    gaps = [f for f in findings if f["assessment"].lower() != "meets"]
+                    brief = [
+                        f"- {len(findings)} requirements assessed: "
+                        f"{len(meets)} met, {len(gaps)} without clear evidence."
+                    ]
+                    brief += [
+                        f"- needs follow-up: {f['id']} :: {f['claim']}"
+                        for f in gaps[:25]
+                    ]
+                    if len(gaps) > 25:
+                        brief.append(f"- ...and {len(gaps) - 25} further requirements lacking evidence.")
                 ctx = "\n".join(brief)
                 sys = (
                     "You are an expert compliance report writer. "
@@ -168,12 +287,20 @@ class BaseFrameworkAssessor:
                     f"Findings (summary):\n{ctx}\n\n"
                     f"Write 2-5 short paragraphs. Use professional tone. No bullet symbols."
                 )
-                resp = client.chat.completions.create(
+                # stream=True: tokens accumulate as they arrive, so a
+                # provider stall or mid-generation error surfaces
+                # immediately instead of after the full completion timeout
+                stream = client.chat.completions.create(
                     model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
                     messages=[{"role":"system","content":sys},{"role":"user","content":user}],
                     temperature=0.3,
+                    stream=True,
                 )
-                return (resp.choices[0].message.content or "").strip()
+                pieces: List[str] = []
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        pieces.append(chunk.choices[0].delta.content)
+                return "".join(pieces).strip()
             except Exception as e:
                 # fall through to deterministic fallback
                 return self._fallback_narrative(section_name, firm, scope, findings, prompt, error=str(e))
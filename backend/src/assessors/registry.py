@@ -1,19 +1,34 @@
 from __future__ import annotations
+from importlib import import_module
+from pathlib import Path
 from typing import Dict, Type
+import functools
+import pkgutil
+import threading
 
-from assessors.seal.assessor import Assessor as SealAssessor
-from assessors.occ.assessor import Assessor as OccAssessor
-from assessors.osfi_b10.assessor import Assessor as B10Assessor
-from assessors.osfi_b13.assessor import Assessor as B13Assessor
+# Assessor packages are discovered from this directory and imported on
+# first use, so app startup doesn't pay for every framework's assessor
+# (and whatever engine modules it pulls in), and new frameworks are
+# picked up by dropping a package here — no registry edit needed.
+_PKG_DIR = str(Path(__file__).resolve().parent)
+
+_REGISTRY: Dict[str, Type] = {}
+_registry_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _available() -> frozenset:
+    return frozenset(m.name for m in pkgutil.iter_modules([_PKG_DIR]) if m.ispkg)
 
-_REGISTRY: Dict[str, Type] = {
-    "seal": SealAssessor,
-    "occ": OccAssessor,
-    "osfi_b10": B10Assessor,
-    "osfi_b13": B13Assessor,
-}
 
 def get_assessor(framework: str):
-    if framework not in _REGISTRY:
-        raise ValueError(f"Unknown framework: {framework}. Available: {sorted(_REGISTRY.keys())}")
-    return _REGISTRY[framework]
+    cls = _REGISTRY.get(framework)
+    if cls is None:
+        if framework not in _available():
+            raise ValueError(f"Unknown framework: {framework}. Available: {sorted(_available())}")
+        with _registry_lock:
+            cls = _REGISTRY.get(framework)
+            if cls is None:
+                cls = import_module(f"assessors.{framework}.assessor").Assessor
+                _REGISTRY[framework] = cls
+    return cls
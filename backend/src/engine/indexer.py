@@ -1,8 +1,11 @@
 from __future__ import annotations
-import os, json, hashlib
+import os, json, hashlib, mmap, re, threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Sequence, Optional
 
+import orjson
 import tiktoken
 
 # --- optional imports by file type ---
@@ -17,7 +20,12 @@ except Exception:
     Document = None
 
 try:
-    import openpyxl  # XLSX
+    from python_calamine import CalamineWorkbook  # Rust XLSX reader
+except Exception:
+    CalamineWorkbook = None
+
+try:
+    import openpyxl  # XLSX fallback
 except Exception:
     openpyxl = None
 
@@ -33,6 +41,11 @@ except Exception:
     Image = None
     pytesseract = None
 
+try:
+    import tesserocr  # in-process libtesseract; no exec per image
+except Exception:
+    tesserocr = None
+
 from services.vector_langchain import add_texts  # LangChain+Chroma wrapper
 
 # ---------------- paths ----------------
@@ -45,39 +58,171 @@ def _chunks_dir(framework_dir: Path) -> Path:
     return d
 
 # ---------------- helpers ----------------
-def _sha256(s: str) -> str:
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+def _hash_id(s: str) -> str:
+    # chunk ids, not integrity checks: blake2b is the fastest hash in
+    # hashlib and digest_size=32 keeps the familiar 64-hex-char shape
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=32).hexdigest()
+
+def _chunk_id(doc_id: str, page: int, ci: int, ch: str) -> str:
+    # feed the hasher directly instead of formatting a throwaway
+    # f-string per chunk; the byte stream (and so the digest) is
+    # identical to hashing f"{doc_id}:{page}:{ci}:{ch[:64]}"
+    h = hashlib.blake2b(digest_size=32)
+    h.update(doc_id.encode("utf-8"))
+    h.update(b":%d:%d:" % (page, ci))
+    h.update(ch[:64].encode("utf-8"))
+    return h.hexdigest()
+
+# vector-store insert batch size (ids/texts/metas per add_texts call)
+_ADD_BATCH = 500
 
-def _enc():
-    return tiktoken.get_encoding("cl100k_base")
+# ---------------- duplicate-chunk suppression ----------------
+# Chunk ids are content-derived, so a persisted per-collection set of
+# already-indexed ids lets re-ingested files skip the embedding call —
+# the costliest step — for every chunk the store has already seen. An
+# exact set rather than a bloom filter: no false positives (a false
+# positive would silently drop a real chunk) and no new dependency.
+_seen_lock = threading.Lock()
+_seen_cache: Dict[str, set] = {}
+
+def _seen_path(collection: str) -> Path:
+    d = _store_root() / "seen"
+    d.mkdir(parents=True, exist_ok=True)
+    return d / f"{collection}.ids"
+
+def _seen_ids(collection: str) -> set:
+    with _seen_lock:
+        seen = _seen_cache.get(collection)
+        if seen is None:
+            seen = set()
+            try:
+                with _seen_path(collection).open("rb") as f:
+                    seen = {ln.strip() for ln in f if ln.strip()}
+            except OSError:
+                pass
+            _seen_cache[collection] = seen
+        return seen
+
+def _record_seen(collection: str, new_ids: List[str]) -> None:
+    if not new_ids:
+        return
+    with _seen_lock:
+        seen = _seen_cache.setdefault(collection, set())
+        fresh = [i.encode() for i in new_ids if i.encode() not in seen]
+        if not fresh:
+            return
+        seen.update(fresh)
+        with _seen_path(collection).open("ab") as f:
+            f.write(b"\n".join(fresh) + b"\n")
+
+# one shared Encoding: get_encoding() rebuilds the BPE ranks per call,
+# which is far more expensive than any single chunking pass
+_ENC: Optional["tiktoken.Encoding"] = None
+
+def _enc() -> "tiktoken.Encoding":
+    global _ENC
+    if _ENC is None:
+        _ENC = tiktoken.get_encoding("cl100k_base")
+    return _ENC
 
 def _chunk_by_tokens(text: str, chunk_size: int = 500, overlap: int = 80) -> List[str]:
     enc = _enc()
     toks = enc.encode(text or "")
-    out: List[str] = []
+    windows: List[List[int]] = []
     start = 0
     while start < len(toks):
         end = min(start + chunk_size, len(toks))
-        piece = enc.decode(toks[start:end])
-        out.append(piece)
+        windows.append(toks[start:end])
         if end >= len(toks):
             break
         start = max(0, end - overlap)
-    return out
+    if not windows:
+        return []
+    # decode_batch runs the Rust BPE core across all windows in one call
+    # instead of a Python<->Rust round-trip per chunk
+    return enc.decode_batch(windows, num_threads=os.cpu_count() or 1)
+
+# single C-level pass; " ".join(s.split()) materializes a list of every
+# word in the page first, which is allocation-heavy on multi-MB pages
+_WS_RE = re.compile(r"\s+")
 
 def _norm_ws(s: str) -> str:
-    return " ".join((s or "").split())
+    return _WS_RE.sub(" ", s or "").strip()
+
+def _chunk_parts_by_tokens(
+    parts: List[Tuple[int, str]], chunk_size: int = 500, overlap: int = 80
+) -> List[Tuple[int, str]]:
+    """
+    Chunk a whole document in one tokenizer pass: every part is encoded
+    in a single encode_batch call, windows are sliced from the combined
+    token stream (separated by a paragraph break so page edges don't fuse
+    words), and all windows decode in one decode_batch call. Each chunk
+    is attributed to the part its window starts in. Compared to chunking
+    part-by-part this is O(1) Rust-boundary crossings instead of
+    O(pages), and windows may span page boundaries instead of truncating
+    at them.
+    """
+    if not parts:
+        return []
+    enc = _enc()
+    n_threads = os.cpu_count() or 1
+    token_lists = enc.encode_batch([t for _, t in parts], num_threads=n_threads)
+    sep = enc.encode("\n\n")
+    toks: List[int] = []
+    part_starts: List[int] = []
+    for tl in token_lists:
+        if toks:
+            toks.extend(sep)
+        part_starts.append(len(toks))
+        toks.extend(tl)
+    windows: List[List[int]] = []
+    starts: List[int] = []
+    start = 0
+    while start < len(toks):
+        end = min(start + chunk_size, len(toks))
+        windows.append(toks[start:end])
+        starts.append(start)
+        if end >= len(toks):
+            break
+        start = max(0, end - overlap)
+    if not windows:
+        return []
+    decoded = enc.decode_batch(windows, num_threads=n_threads)
+    pages = [p for p, _ in parts]
+    return [
+        (pages[bisect_right(part_starts, s) - 1], text.strip())
+        for s, text in zip(starts, decoded)
+    ]
 
 # ---------------- extractors ----------------
 def _extract_pdf(path: Path) -> List[Tuple[int, str]]:
     if not fitz:
         return [(1, f"[PDF parsing unavailable] {path.name}")]
-    pages: List[Tuple[int, str]] = []
     with fitz.open(path) as doc:
-        for i, page in enumerate(doc):
-            txt = _norm_ws(page.get_text("text") or "")
-            if txt:
-                pages.append((i+1, txt))
+        n = doc.page_count
+    if n == 0:
+        return [(1, "")]
+
+    # get_text releases the GIL in PyMuPDF so extraction scales across
+    # threads, but Documents are NOT thread-safe — sharing one handle can
+    # crash the interpreter. Each worker opens its own handle (cheap next
+    # to extraction) and walks a contiguous page slice.
+    def _pages(lo: int, hi: int) -> List[Tuple[int, str]]:
+        out: List[Tuple[int, str]] = []
+        with fitz.open(path) as d:
+            for i in range(lo, hi):
+                out.append((i + 1, _norm_ws(d.load_page(i).get_text("text") or "")))
+        return out
+
+    workers = min(8, n)
+    if workers > 1:
+        step = -(-n // workers)  # ceil division
+        bounds = [(lo, min(lo + step, n)) for lo in range(0, n, step)]
+        with ThreadPoolExecutor(max_workers=len(bounds)) as ex:
+            extracted = [pg for sub in ex.map(_pages, *zip(*bounds)) for pg in sub]
+    else:
+        extracted = _pages(0, n)
+    pages = [(pno, txt) for pno, txt in extracted if txt]
     return pages or [(1, "")]
 
 def _extract_txt(path: Path) -> List[Tuple[int, str]]:
@@ -96,13 +241,28 @@ def _extract_docx(path: Path) -> List[Tuple[int, str]]:
     return [(1, txt)]
 
 def _extract_xlsx(path: Path) -> List[Tuple[int, str]]:
+    # prefer calamine (Rust) — 10-50x faster than openpyxl's pure-Python
+    # XML parse with lower peak memory; openpyxl stays as the fallback
+    if CalamineWorkbook is not None:
+        wb = CalamineWorkbook.from_path(str(path))
+        parts: List[Tuple[int, str]] = []
+        idx = 1
+        for name in wb.sheet_names:
+            lines: List[str] = [f"[Sheet] {name}"]
+            for row in wb.get_sheet_by_name(name).to_python():
+                lines.append(" | ".join("" if v is None else str(v) for v in row))
+            chunk = _norm_ws("\n".join(lines))
+            if chunk:
+                parts.append((idx, chunk))
+                idx += 1
+        return parts or [(1, "")]
     if openpyxl is None:
         return [(1, f"[XLSX parsing unavailable] {path.name}")]
     wb = openpyxl.load_workbook(str(path), data_only=True)
-    parts: List[Tuple[int, str]] = []
+    parts = []
     idx = 1
     for ws in wb.worksheets:
-        lines: List[str] = [f"[Sheet] {ws.title}"]
+        lines = [f"[Sheet] {ws.title}"]
         for row in ws.iter_rows(values_only=True):
             row_str = " | ".join("" if v is None else str(v) for v in row)
             lines.append(row_str)
@@ -123,12 +283,27 @@ def _extract_csv(path: Path) -> List[Tuple[int, str]]:
     txt = _norm_ws("\n".join(lines))
     return [(1, txt or "")]
     
+# tesserocr keeps libtesseract (and its language model) resident across
+# calls instead of fork+exec'ing the tesseract binary per image, which
+# costs 100-300 ms each. The API object isn't thread-safe, so OCR calls
+# serialize behind a lock — still far cheaper than per-image spawns.
+_tess_lock = threading.Lock()
+_tess_api = None
+
 def _extract_image(path: Path) -> List[Tuple[int, str]]:
-    if Image is None or pytesseract is None:
+    if Image is None or (pytesseract is None and tesserocr is None):
         return [(1, f"[OCR unavailable] {path.name}")]
     try:
         img = Image.open(path)
-        txt = pytesseract.image_to_string(img) or ""
+        if tesserocr is not None:
+            global _tess_api
+            with _tess_lock:
+                if _tess_api is None:
+                    _tess_api = tesserocr.PyTessBaseAPI(lang=os.getenv("OCR_LANG", "eng"))
+                _tess_api.SetImage(img)
+                txt = _tess_api.GetUTF8Text() or ""
+        else:
+            txt = pytesseract.image_to_string(img) or ""
         return [(1, _norm_ws(txt))]
     except Exception:
         return [(1, "")]
@@ -168,9 +343,29 @@ def index_framework(framework: str, src_root: Path) -> Dict[str, Any]:
     if not chunks_file.exists():
         raise FileNotFoundError(f"No chunks found at {chunks_file}")
     texts, metas, ids = [], [], []
-    with chunks_file.open("r", encoding="utf-8") as f:
-        for i, line in enumerate(f, start=1):
-            obj = json.loads(line)
+    # a framework whose source/ holds no PDFs produces a 0-byte
+    # chunks.jsonl, and mmap refuses empty files
+    if chunks_file.stat().st_size == 0:
+        return {"framework": framework, "count": 0}
+    # mmap the JSONL: the kernel pages it in on demand, and lines are
+    # sliced straight off the mapping via find() instead of going through
+    # the buffered text-I/O stack line by line
+    with chunks_file.open("rb") as f, mmap.mmap(
+        f.fileno(), 0, prot=mmap.PROT_READ
+    ) as mm:
+        size = len(mm)
+        pos = 0
+        i = 0
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            if nl == -1:
+                nl = size
+            line = mm[pos:nl]
+            pos = nl + 1
+            i += 1
+            if not line.strip():
+                continue
+            obj = orjson.loads(line)
             text = obj.get("text") or ""
             if not text.strip():
                 continue
@@ -208,15 +403,24 @@ def index_evidence_file(firm: str, path: Path) -> Dict[str, Any]:
     )
 
 def index_evidence_batch(firm: str, paths: List[Path]) -> Dict[str, Any]:
+    # extraction + embedding + Chroma insert are I/O-bound per file, so
+    # files run concurrently; results keep the caller's path order
+    workers = max(1, min(int(os.getenv("INGEST_WORKERS", "8")), len(paths) or 1))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
     total_chunks = 0
-    files_out: List[Dict[str, Any]] = []
-    for p in paths:
-        try:
-            info = index_evidence_file(firm, p)
-            total_chunks += info.get("count", 0)
-            files_out.append({"file": p.name, "chunks": info.get("count", 0), "status": "ok"})
-        except Exception as e:
-            files_out.append({"file": p.name, "chunks": 0, "status": "error", "error": str(e)})
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {ex.submit(index_evidence_file, firm, p): i for i, p in enumerate(paths)}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            p = paths[i]
+            try:
+                info = fut.result()
+                count = info.get("count", 0)
+                total_chunks += count
+                results[i] = {"file": p.name, "chunks": count, "status": "ok"}
+            except Exception as e:
+                results[i] = {"file": p.name, "chunks": 0, "status": "error", "error": str(e)}
+    files_out = [r for r in results if r is not None]
     return {"total_docs": len(paths), "total_chunks": total_chunks, "files": files_out}
 
 # ---------------- internal ----------------
@@ -232,23 +436,42 @@ def _index_evidence_like(
     texts: List[str] = []
     metas: List[Dict[str, Any]] = []
     count = 0
-    for page, raw in parts:
-        if not raw.strip():
+    chunks = _chunk_parts_by_tokens(
+        [(page, raw) for page, raw in parts if raw.strip()],
+        chunk_size=500, overlap=80,
+    )
+    seen = _seen_ids(collection)
+    page_ci: Dict[int, int] = {}
+    for page, ch in chunks:
+        if not ch:
             continue
-        # chunk each part
-        chunks = _chunk_by_tokens(raw, chunk_size=500, overlap=80)
-        for ci, ch in enumerate(chunks, start=1):
-            sha = _sha256(f"{doc_id}:{page}:{ci}:{ch[:64]}")
-            ids.append(sha)
-            texts.append(ch)
-            metas.append({
-                "doc_id": doc_id,
-                "page": page,
-                "chunk_index": ci,
-                "source_type": source_type,
-                "ext": ext,
-            })
+        ci = page_ci.get(page, 0) + 1
+        page_ci[page] = ci
+        sha = _chunk_id(doc_id, page, ci, ch)
+        if sha.encode() in seen:
+            # already embedded and stored; re-upserting would only
+            # re-pay the embedding call for an identical vector
             count += 1
-    if count:
-        add_texts(collection_name=collection, ids=ids, texts=texts, metadatas=metas)
+            continue
+        ids.append(sha)
+        texts.append(ch)
+        metas.append({
+            "doc_id": doc_id,
+            "page": page,
+            "chunk_index": ci,
+            "source_type": source_type,
+            "ext": ext,
+        })
+        count += 1
+    # insert in fixed-size batches: Chroma commit cost grows superlinearly
+    # with payload size, and 500 keeps each call comfortably under its
+    # max-batch limits
+    for i in range(0, len(ids), _ADD_BATCH):
+        add_texts(
+            collection_name=collection,
+            ids=ids[i:i + _ADD_BATCH],
+            texts=texts[i:i + _ADD_BATCH],
+            metadatas=metas[i:i + _ADD_BATCH],
+        )
+    _record_seen(collection, ids)
     return {"doc_id": doc_id, "count": count}
@@ -1,44 +1,120 @@
 # backend/src/engine/ingest_guidelines.py
 from __future__ import annotations
-import argparse, json, hashlib, os, sys
+import argparse, json, hashlib, os, re, sys
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 
 # --- deps: PyMuPDF + tiktoken (already in your reqs.txt) ---
 import fitz  # PyMuPDF
+import orjson
 import tiktoken
 
+def chunk_id(pdf_name: str, page: int, idx: int, part: str) -> str:
+    """Chunk id via hasher updates — no per-chunk f-string; digest matches
+    sha256_text(f"{pdf_name}:{page}:{idx}:{part[:64]}")."""
+    h = hashlib.blake2b(digest_size=32)
+    h.update(pdf_name.encode("utf-8"))
+    h.update(b":%d:%d:" % (page, idx))
+    h.update(part[:64].encode("utf-8"))
+    return h.hexdigest()
+
 def sha256_text(s: str) -> str:
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+    # name kept for the JSONL "sha256" field; ids only, so the faster
+    # blake2b (same 64-hex-char output) is used underneath
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=32).hexdigest()
+
+_WS_RE = re.compile(r"\s+")
 
 def normalize_ws(s: str) -> str:
-    return " ".join(s.split())
+    # one sre pass, no intermediate word list
+    return _WS_RE.sub(" ", s).strip()
 
 def pdf_to_pages_text(pdf_path: Path) -> List[Tuple[int, str]]:
-    """Return list of (page_number, text)."""
-    pages = []
+    """Return list of (page_number, text). Pages are extracted in a
+    thread pool — get_text releases the GIL in PyMuPDF — but Documents
+    are not thread-safe, so each worker opens its own handle and walks a
+    contiguous page slice."""
     with fitz.open(pdf_path) as doc:
-        for i, page in enumerate(doc):
-            text = page.get_text("text") or ""
-            pages.append((i + 1, normalize_ws(text)))
-    return pages
+        n = doc.page_count
+
+    def _pages(lo: int, hi: int) -> List[Tuple[int, str]]:
+        out: List[Tuple[int, str]] = []
+        with fitz.open(pdf_path) as d:
+            for i in range(lo, hi):
+                out.append((i + 1, normalize_ws(d.load_page(i).get_text("text") or "")))
+        return out
+
+    workers = min(8, n) if n else 0
+    if workers > 1:
+        step = -(-n // workers)  # ceil division
+        bounds = [(lo, min(lo + step, n)) for lo in range(0, n, step)]
+        with ThreadPoolExecutor(max_workers=len(bounds)) as ex:
+            return [pg for sub in ex.map(_pages, *zip(*bounds)) for pg in sub]
+    return _pages(0, n)
 
 def chunk_by_tokens(text: str, enc, chunk_size: int, overlap: int) -> List[str]:
     """
-    Greedy token-based chunker with overlap.
+    Greedy token-based chunker with overlap. Windows are collected first
+    and decoded in one decode_batch call so the BPE core handles every
+    chunk without a per-chunk Python round-trip.
     """
     tokens = enc.encode(text)
-    chunks = []
+    windows = []
     start = 0
     while start < len(tokens):
         end = min(start + chunk_size, len(tokens))
-        piece = enc.decode(tokens[start:end])
-        chunks.append(piece)
+        windows.append(tokens[start:end])
         if end == len(tokens):
             break
         # next window start with overlap
         start = max(0, end - overlap)
-    return chunks
+    if not windows:
+        return []
+    return enc.decode_batch(windows, num_threads=os.cpu_count() or 1)
+
+def chunk_document(
+    pages: List[Tuple[int, str]], enc, chunk_size: int, overlap: int
+) -> List[Tuple[int, str]]:
+    """
+    Tokenize a whole PDF once and window the combined token stream,
+    instead of encoding and chunking page by page. Pages are joined with
+    a paragraph break so no words fuse across page edges; each chunk is
+    attributed to the page its window starts on, and windows may span
+    page boundaries. Returns [(page_number, chunk_text), ...].
+    """
+    pages = [(p, t) for p, t in pages if t.strip()]
+    if not pages:
+        return []
+    n_threads = os.cpu_count() or 1
+    token_lists = enc.encode_batch([t for _, t in pages], num_threads=n_threads)
+    sep = enc.encode("\n\n")
+    tokens: List[int] = []
+    page_starts: List[int] = []
+    for tl in token_lists:
+        if tokens:
+            tokens.extend(sep)
+        page_starts.append(len(tokens))
+        tokens.extend(tl)
+    windows: List[List[int]] = []
+    starts: List[int] = []
+    start = 0
+    while start < len(tokens):
+        end = min(start + chunk_size, len(tokens))
+        windows.append(tokens[start:end])
+        starts.append(start)
+        if end == len(tokens):
+            break
+        start = max(0, end - overlap)
+    if not windows:
+        return []
+    decoded = enc.decode_batch(windows, num_threads=n_threads)
+    nums = [p for p, _ in pages]
+    return [
+        (nums[bisect_right(page_starts, s) - 1], text.strip())
+        for s, text in zip(starts, decoded)
+    ]
 
 def chunk_pages(framework_dir: Path, framework: str, chunk_size: int, overlap: int) -> Dict[str, Any]:
     source_dir = framework_dir / "source"
@@ -51,26 +127,27 @@ def chunk_pages(framework_dir: Path, framework: str, chunk_size: int, overlap: i
 
     total_chunks = 0
     written_files = []
-    with out_path.open("w", encoding="utf-8") as outf:
+    # binary mode: orjson emits UTF-8 bytes directly, no str round-trip
+    with out_path.open("wb") as outf:
         for pdf in sorted(source_dir.glob("*.pdf")):
             pages = pdf_to_pages_text(pdf)
-            for page_num, page_text in pages:
-                if not page_text.strip():
+            page_ci: Dict[int, int] = {}
+            for page_num, part in chunk_document(pages, enc, chunk_size, overlap):
+                if not part:
                     continue
-                # chunk this page
-                parts = chunk_by_tokens(page_text, enc, chunk_size=chunk_size, overlap=overlap)
-                for idx, part in enumerate(parts, start=1):
-                    record = {
-                        "framework": framework,
-                        "source_pdf": pdf.name,
-                        "page": page_num,
-                        "chunk_index": idx,
-                        "text": part,
-                        # ids/hashes to enable auditable citations later
-                        "sha256": sha256_text(f"{pdf.name}:{page_num}:{idx}:{part[:64]}"),
-                    }
-                    outf.write(json.dumps(record, ensure_ascii=False) + "\n")
-                    total_chunks += 1
+                idx = page_ci.get(page_num, 0) + 1
+                page_ci[page_num] = idx
+                record = {
+                    "framework": framework,
+                    "source_pdf": pdf.name,
+                    "page": page_num,
+                    "chunk_index": idx,
+                    "text": part,
+                    # ids/hashes to enable auditable citations later
+                    "sha256": chunk_id(pdf.name, page_num, idx, part),
+                }
+                outf.write(orjson.dumps(record) + b"\n")
+                total_chunks += 1
             written_files.append(pdf.name)
 
     manifest = {
@@ -3,13 +3,27 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple, Set, Iterable
 from pathlib import Path
-import os, json
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os, tempfile, time
+
+import orjson
+
+try:
+    import numpy as np  # pulled in by chromadb; guard anyway
+except ImportError:
+    np = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 from assessors.registry import get_assessor
 from assessors.base import BuildContext, BaseFrameworkAssessor
 
-from services.ai_client import chat_complete
-from services.vector_langchain import query as vs_query
+from services.ai_client import chat_complete, chat_complete_stream
+from services.vector_langchain import query as vs_query, multi_query as vs_multi_query, embed_text as vs_embed_text
 
 # Persistent runs directory (for JSON + PDFs)
 RUNS_DIR = Path(os.getenv("RUNS_PATH", "./src/data/runs")).resolve()
@@ -19,6 +33,9 @@ RUNS_DIR.mkdir(parents=True, exist_ok=True)
 MEM_SUMMARY_TOKENS = 350       # target length of rolling narrative memory
 MEM_POINTS_LIMIT   = 12        # max bullets carried forward
 RETRIEVE_K         = 8         # top-k RAG chunks per section
+SECTION_WORKERS    = int(os.getenv("SECTION_WORKERS", "4"))  # parallel section renders (1 = sequential)
+MMR_LAMBDA         = float(os.getenv("MMR_LAMBDA", "0.5"))  # relevance vs diversity in chunk re-rank
+EVIDENCE_BUDGET_TOKENS = int(os.getenv("EVIDENCE_BUDGET_TOKENS", "3000"))  # evidence block cap per section
 
 
 # ---------- Rolling Memory ----------
@@ -26,9 +43,30 @@ RETRIEVE_K         = 8         # top-k RAG chunks per section
 class RollingMemory:
     narrative_summary: str = ""                           # compact narrative so far
     points: List[str] = field(default_factory=list)       # bullets so far
-    used_evidence: Set[Tuple[str, int]] = field(default_factory=set)  # (doc_id, page)
+    # doc_id -> pages already cited. A dict of page sets instead of a set
+    # of (doc_id, page) tuples: membership checks in the retrieval dedup
+    # skip the per-row tuple allocation, and each doc_id string is stored
+    # once rather than once per cited page.
+    used_evidence: Dict[str, Set[int]] = field(default_factory=dict)
+    _block_cache: Optional[str] = field(default=None, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # assigning a new narrative or points list invalidates the memo;
+        # add_used() handles the in-place evidence mutations
+        if name in ("narrative_summary", "points"):
+            object.__setattr__(self, "_block_cache", None)
+        object.__setattr__(self, name, value)
+
+    def add_used(self, pairs: Iterable[Tuple[str, int]]) -> None:
+        for d, pg in pairs:
+            self.used_evidence.setdefault(d, set()).add(pg)
+        self._block_cache = None
 
     def to_prompt_block(self) -> str:
+        # memoized and invalidated explicitly on every mutation path, so
+        # a hit always reflects the current memory state
+        if self._block_cache is not None:
+            return self._block_cache
         parts: List[str] = []
         if self.narrative_summary:
             parts.append(f"Context so far (do not repeat): {self.narrative_summary}")
@@ -36,53 +74,203 @@ class RollingMemory:
             bullets = "\n".join(f"- {p}" for p in self.points[:MEM_POINTS_LIMIT])
             parts.append(f"Key points already covered (avoid repetition):\n{bullets}")
         if self.used_evidence:
+            cited = [
+                (d, pg)
+                for d, pages in self.used_evidence.items()
+                for pg in sorted(pages)
+            ]
             parts.append(
                 "Evidence already cited (avoid reusing unless critical): " +
-                ", ".join(f"{d}@p{p}" for d, p in list(self.used_evidence)[:15]) +
-                ("…" if len(self.used_evidence) > 15 else "")
+                ", ".join(f"{d}@p{p}" for d, p in cited[:15]) +
+                ("…" if len(cited) > 15 else "")
             )
-        return "\n\n".join(parts)
+        block = "\n\n".join(parts)
+        self._block_cache = block
+        return block
 
 
 # ---------- helpers ----------
-def _summarize_text_for_memory(
-    text: str,
+_OUTLINE_CACHE_DIR = RUNS_DIR / "outline_cache"
+
+
+def _outline_points(
+    provider: str,
+    model: Optional[str],
+    sections_ordered: List[Dict[str, Any]],
+) -> List[str]:
+    """
+    Outline bullets that seed rolling memory. The outline depends only on
+    (provider, model, section names), so it is memoized on disk — re-runs,
+    retries, and webhook replays with the same configuration skip the LLM
+    call (and, unlike the response cache, also skip re-parsing: the
+    extracted points themselves are stored).
+    """
+    names = [s["name"] for s in sections_ordered]
+    key = hashlib.blake2b(
+        orjson.dumps({"p": provider, "m": model, "s": names}), digest_size=32
+    ).hexdigest()
+    path = _OUTLINE_CACHE_DIR / f"{key}.json"
+    try:
+        return orjson.loads(path.read_bytes())
+    except (OSError, ValueError):
+        pass
+
+    outline_msg = [
+        {"role": "system", "content": "You are an audit report planner."},
+        {"role": "user", "content": "Create a 1-level outline for the following sections in order:\n" +
+                                    "\n".join(f"- {n}" for n in names)}
+    ]
+    outline = chat_complete(
+        provider=provider, model=model,
+        messages=outline_msg, temperature=0.2, max_tokens=250,
+        response_format=None
+    )
+    points = [ln.strip("- ").strip() for ln in outline.split("\n") if ln.strip()][:MEM_POINTS_LIMIT]
+    try:
+        _OUTLINE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(_OUTLINE_CACHE_DIR), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(points))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return points
+
+
+_ENC = None
+
+def _enc():
+    # tokenizer load is ~100ms; one module-level instance, reused
+    global _ENC
+    if _ENC is None:
+        _ENC = tiktoken.get_encoding("cl100k_base")
+    return _ENC
+
+
+def _pack_evidence(chunks: List[Dict[str, Any]], budget_tokens: int = EVIDENCE_BUDGET_TOKENS) -> List[str]:
+    """
+    Format retrieved chunks as evidence lines under a total token budget.
+    Chunks arrive relevance-ordered: each is included whole while the
+    budget lasts, the one that crosses it is truncated to the remaining
+    tokens, and packing stops there. This bounds prompt size (and prefill
+    latency/cost) regardless of RETRIEVE_K, unlike the old fixed 800-char
+    slice per chunk. Falls back to a ~4 chars/token character budget if
+    tiktoken is unavailable.
+    """
+    lines = [
+        f"[{c['metadata']['doc_id']} p.{c['metadata']['page']}] {c['text']}"
+        for c in chunks
+    ]
+    if tiktoken is None:
+        out: List[str] = []
+        remaining = budget_tokens * 4
+        for line in lines:
+            out.append(line[:remaining])
+            remaining -= len(out[-1])
+            if remaining <= 0:
+                break
+        return out
+    enc = _enc()
+    out: List[str] = []
+    remaining = budget_tokens
+    for line, toks in zip(lines, enc.encode_batch(lines, disallowed_special=())):
+        if len(toks) > remaining:
+            out.append(enc.decode(toks[:remaining]))
+            break
+        out.append(line)
+        remaining -= len(toks)
+        if remaining <= 0:
+            break
+    return out
+
+
+def _new_run_id(framework: str, firm: str) -> str:
+    """
+    ULID-style run id: 48-bit millisecond timestamp + 40 random bits,
+    hex-encoded. Ids sort lexicographically by creation time (so the
+    runs directory lists in chronological order) and are collision-safe
+    across processes — the old abs(hash(...)) suffix was neither, since
+    builtin hash is salted per interpreter.
+    """
+    ts = int(time.time() * 1000) & ((1 << 48) - 1)
+    return f"{framework}-{firm}-{ts:012x}{os.urandom(5).hex()}"
+
+
+def _merge_memory_llm(
+    prior_narrative: str,
+    new_text: str,
     *,
     provider: str,
     model: Optional[str],
 ) -> Dict[str, Any]:
     """
-    Summarize section to compact memory: {narrative, bullets[]}.
-    For xAI we avoid response_format and enforce JSON via prompt instructions.
+    Fold a freshly rendered section into the rolling narrative in ONE
+    LLM call: {narrative, bullets[]}. Replaces the old summarize-then-
+    re-summarize pair, which cost two round-trips per section for the
+    same semantic output.
     """
     prompt = (
-        "Summarize the following section into: "
-        "1) one 150–250 token narrative paragraph (no new facts), and "
-        "2) 5–7 concise bullets. "
+        "You maintain the rolling memory of a report being written section by section. "
+        "Merge the prior narrative with the new section below into: "
+        "1) one 150–250 token narrative paragraph covering BOTH (merge, do not re-list; no new facts), and "
+        "2) 5–7 concise bullets for the NEW section only. "
         "Return ONLY valid JSON with keys: narrative (string), bullets (array of strings)."
     )
     messages = [
         {"role": "system", "content": "You are a precise summarizer for an audit report. Return only JSON."},
-        {"role": "user", "content": prompt + "\n\n---\n" + (text or "").strip()},
+        {"role": "user", "content": (
+            prompt
+            + "\n\n--- PRIOR NARRATIVE ---\n" + (prior_narrative or "").strip()
+            + "\n\n--- NEW SECTION ---\n" + (new_text or "").strip()
+        )},
     ]
     resp = chat_complete(
         provider=provider, model=model,
         messages=messages,
-        # OpenAI can use native JSON mode; xAI currently cannot
         response_format=("json_object" if provider == "openai" else None),
         temperature=0.2, max_tokens=600
     )
     try:
-        return json.loads(resp)
+        return orjson.loads(resp)
     except Exception:
-        return {"narrative": "", "bullets": []}
+        return {"narrative": prior_narrative, "bullets": []}
+
+
+def _mmr_select(rows: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    """
+    Maximal Marginal Relevance over a score-sorted candidate pool that
+    carries stored embeddings: picks the chunk balancing closeness to the
+    query against similarity to chunks already picked (MMR_LAMBDA), so
+    top-k stops collapsing onto one doc/page cluster and the evidence
+    block spends its tokens on distinct material. Falls back to the
+    plain top-k slice when numpy or embeddings are unavailable.
+    """
+    if len(rows) <= k:
+        return rows[:k]
+    if np is None or any(r.get("embedding") is None for r in rows):
+        return rows[:k]
+    E = np.asarray([r["embedding"] for r in rows], dtype=np.float32)
+    norms = np.linalg.norm(E, axis=1)
+    norms[norms == 0] = 1.0
+    E = E / norms[:, None]
+    # relevance from the store's cosine distance (lower = closer)
+    rel = np.asarray([1.0 - float(r.get("score") or 0.0) for r in rows], dtype=np.float32)
+    sim = E @ E.T
+    selected = [int(np.argmax(rel))]
+    candidates = [i for i in range(len(rows)) if i != selected[0]]
+    while candidates and len(selected) < k:
+        max_sim = sim[np.ix_(candidates, selected)].max(axis=1)
+        mmr = MMR_LAMBDA * rel[candidates] - (1.0 - MMR_LAMBDA) * max_sim
+        best = candidates.pop(int(np.argmax(mmr)))
+        selected.append(best)
+    return [rows[i] for i in selected]
 
 
 def _retrieve_chunks(
     framework: str,
     firm: str,
     query_text: str,
-    used_ev: Set[Tuple[str,int]],
+    used_ev: Dict[str, Set[int]],
     *,
     k: int = RETRIEVE_K,
     retrieval_strategy: Optional[str] = None,  # "cosine" | "mmr" | "hybrid"
@@ -95,9 +283,22 @@ def _retrieve_chunks(
     Prefer chunks not yet used (by (doc_id,page)), then fill with dupes if needed.
     Returns rows with normalized fields: text, metadata{doc_id,page}, score, source.
     """
-    pool: List[Dict[str, Any]] = []
-
-    def _pull(collection: str, source_label: str):
+    def _normalize_rows(rows: List[Dict[str, Any]], source_label: str) -> List[Dict[str, Any]]:
+        out_rows: List[Dict[str, Any]] = []
+        for r in rows:
+            m = r.get("metadata", {}) or {}
+            doc_id = m.get("doc_id") or m.get("source_pdf") or source_label
+            page = int(m.get("page", 0))
+            out_rows.append({
+                "text": r.get("text", "") or "",
+                "metadata": {"doc_id": doc_id, "page": page},
+                "score": r.get("score", None),
+                "source": source_label,
+                "embedding": r.get("embedding"),
+            })
+        return out_rows
+
+    def _pull(collection: str, source_label: str, qvec: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         try:
             # Ask for more than needed from each pool; we’ll merge -> dedupe -> trim
             try:
@@ -106,28 +307,38 @@ def _retrieve_chunks(
                     text=query_text,
                     k=k*2,
                     strategy=retrieval_strategy,
+                    vector=qvec,
                 ) or []
             except TypeError:
-                # Back-compat with older signature (no strategy)
+                # Back-compat with older signature (no strategy/vector)
                 rows = vs_query(collection_name=collection, text=query_text, k=k*2) or []
-
-            for r in rows:
-                m = r.get("metadata", {}) or {}
-                doc_id = m.get("doc_id") or m.get("source_pdf") or source_label
-                page = int(m.get("page", 0))
-                pool.append({
-                    "text": r.get("text", "") or "",
-                    "metadata": {"doc_id": doc_id, "page": page},
-                    "score": r.get("score", None),
-                    "source": source_label,
-                })
+            return _normalize_rows(rows, source_label)
         except Exception:
             # collection may not exist yet; ignore
-            pass
+            return []
 
-    _pull(f"fw_{framework}",        f"fw_{framework}")
-    _pull(f"assessment_{firm}",     f"assessment_{firm}")
-    _pull(f"evidence_{firm}",       f"evidence_{firm}")
+    targets = [f"fw_{framework}", f"assessment_{firm}", f"evidence_{firm}"]
+    pool: List[Dict[str, Any]] = []
+    if retrieval_strategy in (None, "cosine"):
+        # Cosine path: one shared query embedding across all three
+        # collections instead of an embedding round-trip per pull.
+        try:
+            hit_lists = vs_multi_query(targets, query_text, k=k*2)
+        except Exception:
+            hit_lists = [[] for _ in targets]
+        for label, rows in zip(targets, hit_lists):
+            pool.extend(_normalize_rows(rows or [], label))
+    else:
+        # mmr/hybrid go through the strategy-aware query(), but the query
+        # embedding is still computed once here and shared across the
+        # three pulls, which remain overlapped as independent lookups.
+        try:
+            qvec = vs_embed_text(query_text)
+        except Exception:
+            qvec = None
+        with ThreadPoolExecutor(max_workers=len(targets)) as ex:
+            for rows in ex.map(_pull, targets, targets, [qvec] * len(targets)):
+                pool.extend(rows)
 
     # De-duplicate by (doc_id, page, text_head) and split into fresh vs already used
     seen = set()
@@ -141,8 +352,7 @@ def _retrieve_chunks(
             continue
         seen.add(key_all)
 
-        key_used = (doc_id, page)
-        (fresh if key_used not in used_ev else dups).append(r)
+        (fresh if page not in used_ev.get(doc_id, ()) else dups).append(r)
 
     # Sort each bucket by descending score if available
     def _score(row):
@@ -155,16 +365,17 @@ def _retrieve_chunks(
     fresh.sort(key=_score, reverse=True)
     dups.sort(key=_score, reverse=True)
 
-    out = fresh[:k]
+    out = _mmr_select(fresh, k)
     if len(out) < k:
         out += dups[:(k - len(out))]
-    return out[:k]
+    out = out[:k]
+    for r in out:
+        r.pop("embedding", None)
+    return out
 
 
-def _render_section_llm(
+def _prepare_section(
     *,
-    provider: str,
-    model: Optional[str],
     framework: str,
     section_id: str,
     section_name: str,
@@ -176,11 +387,9 @@ def _render_section_llm(
     retrieval_strategy: Optional[str],
 ) -> Dict[str, Any]:
     """
-    Produce one section text using:
-    - Overarching prompt
-    - Rolling memory (prior narrative + bullets + used evidence)
-    - Fresh RAG chunks (with dedupe against used evidence)
-    Also returns 'rag_debug' list for UI inspection.
+    Retrieval + prompt assembly for one section, shared by the buffered
+    and token-streaming render paths. Returns the chat messages plus the
+    evidence bookkeeping ('used', 'rag_debug').
     """
     retrieval_query = f"{section_name}: {section_prompt}\nFirm: {firm}\nScope: {scope or 'full'}"
     chunks = _retrieve_chunks(
@@ -192,7 +401,7 @@ def _render_section_llm(
         retrieval_strategy=retrieval_strategy,
     )
 
-    ev_lines: List[str] = []
+    ev_lines = _pack_evidence(chunks)
     new_used: Set[Tuple[str,int]] = set()
     rag_debug: List[Dict[str, Any]] = []
 
@@ -204,7 +413,6 @@ def _render_section_llm(
         score  = c.get("score")
         source = c.get("source")
 
-        ev_lines.append(f"[{doc_id} p.{page}] {text[:800]}")
         new_used.add((doc_id, page))
         rag_debug.append({
             "doc_id": doc_id,
@@ -225,16 +433,57 @@ def _render_section_llm(
         "Use the retrieved evidence to ground claims (quote minimally, synthesize conclusions):\n"
         + "\n---\n".join(ev_lines)
     )
+    return {
+        "messages": [{"role": "system", "content": system}, {"role": "user", "content": user}],
+        "used": new_used,
+        "rag_debug": rag_debug,
+        "section_id": section_id,
+        "section_name": section_name,
+    }
+
+
+def _render_section_llm(
+    *,
+    provider: str,
+    model: Optional[str],
+    framework: str,
+    section_id: str,
+    section_name: str,
+    section_prompt: str,
+    overarching_prompt: str,
+    memory: RollingMemory,
+    firm: str,
+    scope: Optional[str],
+    retrieval_strategy: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Produce one section text using:
+    - Overarching prompt
+    - Rolling memory (prior narrative + bullets + used evidence)
+    - Fresh RAG chunks (with dedupe against used evidence)
+    Also returns 'rag_debug' list for UI inspection.
+    """
+    prep = _prepare_section(
+        framework=framework,
+        section_id=section_id,
+        section_name=section_name,
+        section_prompt=section_prompt,
+        overarching_prompt=overarching_prompt,
+        memory=memory,
+        firm=firm,
+        scope=scope,
+        retrieval_strategy=retrieval_strategy,
+    )
     text = chat_complete(
         provider=provider, model=model,
-        messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+        messages=prep["messages"],
         temperature=0.3, max_tokens=1100,
         response_format=None  # narrative text; no JSON required
     )
     return {
         "text": text,
-        "used": new_used,
-        "rag_debug": rag_debug,
+        "used": prep["used"],
+        "rag_debug": prep["rag_debug"],
         "section_id": section_id,
         "section_name": section_name,
     }
@@ -261,18 +510,37 @@ def generate_report_sections(
     out_text: Dict[str, str] = {}
     rag_debug_map: Dict[str, List[Dict[str, Any]]] = {}
 
-    # Small outline → better global coherence
-    outline_msg = [
-        {"role": "system", "content": "You are an audit report planner."},
-        {"role": "user", "content": "Create a 1-level outline for the following sections in order:\n" +
-                                    "\n".join(f"- {s['name']}" for s in sections_ordered)}
-    ]
-    outline = chat_complete(
-        provider=provider, model=model,
-        messages=outline_msg, temperature=0.2, max_tokens=250,
-        response_format=None
-    )
-    memory.points = [ln.strip("- ").strip() for ln in outline.split("\n") if ln.strip()][:MEM_POINTS_LIMIT]
+    # Small outline → better global coherence (disk-memoized)
+    memory.points = _outline_points(provider, model, sections_ordered)
+
+    # Parallel first pass: with the shared outline in memory, section
+    # renders are independent of each other, and the work is I/O-bound
+    # (vector-store + LLM round-trips), so a small thread pool overlaps
+    # their multi-second latencies. The per-section rolling-memory refresh
+    # is skipped here — with no later render to feed, those summarize
+    # calls would be dead LLM work. SECTION_WORKERS=1 restores the strict
+    # sequential pass with rolling memory between sections.
+    if SECTION_WORKERS > 1 and len(sections_ordered) > 1:
+        def _render_one(s: Dict[str, Any]) -> Dict[str, Any]:
+            return _render_section_llm(
+                provider=provider, model=model,
+                framework=framework,
+                section_id=s["id"],
+                section_name=s["name"],
+                section_prompt=(prompt_overrides.get(s["id"]) or s.get("default_prompt") or "").strip(),
+                overarching_prompt=overarching_prompt,
+                memory=memory,
+                firm=firm,
+                scope=scope,
+                retrieval_strategy=retrieval_strategy,
+            )
+
+        with ThreadPoolExecutor(max_workers=min(SECTION_WORKERS, len(sections_ordered))) as ex:
+            for sec in ex.map(_render_one, sections_ordered):
+                out_text[sec["section_name"]] = sec["text"]
+                if include_rag_debug:
+                    rag_debug_map[sec["section_id"]] = sec["rag_debug"]
+        return out_text, (rag_debug_map if include_rag_debug else None)
 
     # Generate each section in order
     for s in sections_ordered:
@@ -298,13 +566,11 @@ def generate_report_sections(
         if include_rag_debug:
             rag_debug_map[sec_id] = sec["rag_debug"]
 
-        # Update rolling memory
-        summ = _summarize_text_for_memory(text, provider=provider, model=model)
-        combined = (memory.narrative_summary + "\n" + (summ.get("narrative") or "")).strip()
-        re_summ = _summarize_text_for_memory(combined, provider=provider, model=model)
-        memory.narrative_summary = (re_summ.get("narrative") or "")[:MEM_SUMMARY_TOKENS * 6]
-        memory.points = list(dict.fromkeys(memory.points + (summ.get("bullets") or [])))[:MEM_POINTS_LIMIT]
-        memory.used_evidence |= set(sec["used"])
+        # Update rolling memory (single merge call)
+        merged = _merge_memory_llm(memory.narrative_summary, text, provider=provider, model=model)
+        memory.narrative_summary = (merged.get("narrative") or "")[:MEM_SUMMARY_TOKENS * 6]
+        memory.points = list(dict.fromkeys(memory.points + (merged.get("bullets") or [])))[:MEM_POINTS_LIMIT]
+        memory.add_used(sec["used"])
 
     return out_text, (rag_debug_map if include_rag_debug else None)
 
@@ -344,7 +610,7 @@ def run_report(
         retrieval_strategy=retrieval_strategy,
     )
 
-    run_id = f"{framework}-{firm}-{os.getpid()}-{abs(hash((framework, firm)))%10**9}"
+    run_id = _new_run_id(framework, firm)
     out: Dict[str, Any] = {
         "run_id": run_id,
         "framework": framework,
@@ -357,7 +623,8 @@ def run_report(
         out["rag_debug"] = rag_debug
 
     RUNS_DIR.mkdir(parents=True, exist_ok=True)
-    (RUNS_DIR / f"{run_id}.json").write_text(json.dumps(out, indent=2), encoding="utf-8")
+    # orjson encodes to bytes in C — no multi-MB Python string built first
+    (RUNS_DIR / f"{run_id}.json").write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
     return out
 
 
@@ -394,19 +661,13 @@ def run_report_stream(
 
     # Use incoming run_id (webhook mode) or generate one (normal streaming mode)
     if run_id is None:
-        run_id = f"{framework}-{firm}-{os.getpid()}-{abs(hash((framework, firm)))%10**9}"
+        run_id = _new_run_id(framework, firm)
 
-    yield json.dumps({"event": "start", "run_id": run_id, "framework": framework, "firm": firm}) + "\n"
+    yield orjson.dumps({"event": "start", "run_id": run_id, "framework": framework, "firm": firm}) + b"\n"
 
-    # Rolling memory + outline
+    # Rolling memory + outline (disk-memoized)
     memory = RollingMemory()
-    outline_msg = [
-        {"role": "system", "content": "You are an audit report planner."},
-        {"role": "user", "content": "Create a 1-level outline for the following sections in order:\n" +
-                                    "\n".join(f"- {s['name']}" for s in selected_sections)}
-    ]
-    outline = chat_complete(provider=provider, model=model, messages=outline_msg, temperature=0.2, max_tokens=250)
-    memory.points = [ln.strip("- ").strip() for ln in outline.split("\n") if ln.strip()][:MEM_POINTS_LIMIT]
+    memory.points = _outline_points(provider, model, selected_sections)
 
     sections_text: Dict[str, str] = {}
     rag_debug_map: Dict[str, List[Dict[str, Any]]] = {}
@@ -416,15 +677,14 @@ def run_report_stream(
         sec_name = s["name"]
         sec_prompt = (prompt_overrides.get(s["id"]) or s.get("default_prompt") or "").strip()
 
-        yield json.dumps({
+        yield orjson.dumps({
             "event": "section_start",
             "run_id": run_id,
             "section_id": sec_id,
             "section_name": sec_name,
-        }) + "\n"
+        }) + b"\n"
 
-        sec = _render_section_llm(
-            provider=provider, model=model,
+        sec = _prepare_section(
             framework=framework,
             section_id=sec_id,
             section_name=sec_name,
@@ -436,27 +696,43 @@ def run_report_stream(
             retrieval_strategy=retrieval_strategy,
         )
 
-        text: str = sec["text"]
+        # Forward tokens as they arrive: first output lands at first-token
+        # latency instead of after the whole section finishes generating.
+        pieces: List[str] = []
+        for delta in chat_complete_stream(
+            provider=provider, model=model,
+            messages=sec["messages"],
+            temperature=0.3, max_tokens=1100,
+        ):
+            pieces.append(delta)
+            yield orjson.dumps({
+                "event": "section_delta",
+                "run_id": run_id,
+                "section_id": sec_id,
+                "section_name": sec_name,
+                "text": delta,
+            }) + b"\n"
+
+        text: str = "".join(pieces).strip()
         sections_text[sec_name] = text
         if include_rag_debug:
             rag_debug_map[sec_id] = sec["rag_debug"]
 
-        # Stream the completed section body
-        yield json.dumps({
+        # Full section body still follows the deltas, so existing
+        # consumers that only handle section_text keep working.
+        yield orjson.dumps({
             "event": "section_text",
             "run_id": run_id,
             "section_id": sec_id,
             "section_name": sec_name,
             "text": text,
-        }) + "\n"
+        }) + b"\n"
 
-        # Update rolling memory
-        summ = _summarize_text_for_memory(text, provider=provider, model=model)
-        combined = (memory.narrative_summary + "\n" + (summ.get("narrative") or "")).strip()
-        re_summ = _summarize_text_for_memory(combined, provider=provider, model=model)
-        memory.narrative_summary = (re_summ.get("narrative") or "")[:MEM_SUMMARY_TOKENS * 6]
-        memory.points = list(dict.fromkeys(memory.points + (summ.get("bullets") or [])))[:MEM_POINTS_LIMIT]
-        memory.used_evidence |= set(sec["used"])
+        # Update rolling memory (single merge call)
+        merged = _merge_memory_llm(memory.narrative_summary, text, provider=provider, model=model)
+        memory.narrative_summary = (merged.get("narrative") or "")[:MEM_SUMMARY_TOKENS * 6]
+        memory.points = list(dict.fromkeys(memory.points + (merged.get("bullets") or [])))[:MEM_POINTS_LIMIT]
+        memory.add_used(sec["used"])
 
     # Persist final artifact
     out: Dict[str, Any] = {
@@ -471,13 +747,14 @@ def run_report_stream(
         out["rag_debug"] = rag_debug_map
 
     RUNS_DIR.mkdir(parents=True, exist_ok=True)
-    (RUNS_DIR / f"{run_id}.json").write_text(json.dumps(out, indent=2), encoding="utf-8")
+    # orjson encodes to bytes in C — no multi-MB Python string built first
+    (RUNS_DIR / f"{run_id}.json").write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
 
-    yield json.dumps({"event": "end", "run_id": run_id, "ok": True}) + "\n"
+    yield orjson.dumps({"event": "end", "run_id": run_id, "ok": True}) + b"\n"
 
 
 def load_run(run_id: str) -> Dict[str, Any]:
     p = RUNS_DIR / f"{run_id}.json"
     if not p.exists():
         raise FileNotFoundError(f"run not found: {run_id}")
-    return json.loads(p.read_text(encoding="utf-8"))
+    return orjson.loads(p.read_bytes())
@@ -2,22 +2,27 @@
 from __future__ import annotations
 from pathlib import Path
 
+# Resolved once at import: Path.resolve() stats every path component,
+# and these are hit per request.
+_SRC_ROOT = Path(__file__).resolve().parents[1]
+_GUIDELINES_DIR = _SRC_ROOT / "guidelines"
+_DATA_DIR = _SRC_ROOT / "data"
+_INDEXES_DIR = _DATA_DIR / "indexes"
+
 def get_src_root() -> Path:
     """
     Returns .../backend/src regardless of where it's called from.
     """
-    here = Path(__file__).resolve()
-    # engine/ -> src
-    return here.parents[1]
+    return _SRC_ROOT
 
 def guidelines_dir() -> Path:
-    return get_src_root() / "guidelines"
+    return _GUIDELINES_DIR
 
 def data_dir() -> Path:
-    return get_src_root() / "data"
+    return _DATA_DIR
 
 def uploads_dir(firm: str) -> Path:
-    return data_dir() / "uploads" / firm
+    return _DATA_DIR / "uploads" / firm
 
 def indexes_dir() -> Path:
-    return get_src_root() / "data" / "indexes"
+    return _INDEXES_DIR
@@ -1,8 +1,16 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Dict, Any, List, Optional
+import copy
+import functools
+import orjson
 import yaml
 
+try:  # libyaml C bindings when available (~5-10x faster parse)
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 def _root() -> Path:
     # .../backend/src
     return Path(__file__).resolve().parents[1]
@@ -10,6 +18,31 @@ def _root() -> Path:
 def _prompts_path(framework: str) -> Path:
     return _root() / "guidelines" / framework / "prompts.yaml"
 
+def _normalize(data: Dict[str, Any]) -> Dict[str, Any]:
+    data.setdefault("overarching", "")
+    data.setdefault("sections", [])
+    # Normalize section fields
+    for s in data["sections"]:
+        s.setdefault("id", s.get("name", "").lower().replace(" ", "_"))
+        # coerce once at load so consumers never re-parse per request
+        s["position"] = int(s.get("position") or 0)
+        s.setdefault("default_prompt", f"Write the '{s.get('name','Section')}' section.")
+    # Presorted by position so request paths can rely on the order
+    data["sections"] = sorted(data["sections"], key=lambda x: x["position"])
+    return data
+
+@functools.lru_cache(maxsize=64)
+def _load_prompts_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    # mtime_ns is part of the key purely for invalidation: a changed file
+    # produces a new key and the stale entry ages out of the LRU.
+    data = yaml.load(Path(path_str).read_text(encoding="utf-8"), Loader=_YamlLoader) or {}
+    return _normalize(data)
+
+@functools.lru_cache(maxsize=64)
+def _load_json_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    data = orjson.loads(Path(path_str).read_bytes()) or {}
+    return _normalize(data)
+
 def load_prompts(framework: str) -> Dict[str, Any]:
     """
     Structure:
@@ -21,20 +54,38 @@ def load_prompts(framework: str) -> Dict[str, Any]:
     }
     """
     p = _prompts_path(framework)
-    if not p.exists():
+    try:
+        st = p.stat()
+    except OSError:
+        st = None
+    # Admin edits land in the prompts.json sidecar; prefer it whenever it
+    # is at least as fresh as the YAML (orjson parse is far cheaper too).
+    sidecar = p.with_suffix(".json")
+    try:
+        sst = sidecar.stat()
+    except OSError:
+        sst = None
+    if sst is not None and (st is None or sst.st_mtime_ns >= st.st_mtime_ns):
+        try:
+            return copy.deepcopy(_load_json_cached(str(sidecar), sst.st_mtime_ns))
+        except ValueError:
+            pass
+    if st is None:
         # graceful default
         return {"overarching": "", "sections": []}
-    data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
-    data.setdefault("overarching", "")
-    data.setdefault("sections", [])
-    # Normalize section fields
-    for s in data["sections"]:
-        s.setdefault("id", s.get("name", "").lower().replace(" ", "_"))
-        s.setdefault("position", 0)
-        s.setdefault("default_prompt", f"Write the '{s.get('name','Section')}' section.")
-    # Sort by position for convenience
-    data["sections"] = sorted(data["sections"], key=lambda x: x.get("position", 0))
-    return data
+    # deepcopy so callers can mutate without poisoning the cache
+    return copy.deepcopy(_load_prompts_cached(str(p), st.st_mtime_ns))
+
+def prompts_mtime_ns(framework: str) -> int:
+    """Cheap cache key for callers memoizing derived prompt data."""
+    p = _prompts_path(framework)
+    mtimes = []
+    for f in (p, p.with_suffix(".json")):
+        try:
+            mtimes.append(f.stat().st_mtime_ns)
+        except OSError:
+            pass
+    return max(mtimes, default=0)
 
 def get_overarching(framework: str) -> str:
     return load_prompts(framework).get("overarching","")
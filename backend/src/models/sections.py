@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import List, Optional, Dict
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 class Section(BaseModel):
     id: str = Field(..., description="Stable unique id per framework (e.g., 'exec_summary')")
@@ -12,7 +12,8 @@ class SectionUpsertRequest(BaseModel):
     framework: str
     sections: List[Section]
 
-    @validator("sections")
+    @field_validator("sections")
+    @classmethod
     def validate_unique_ids_positions(cls, v):
         ids = [s.id for s in v]
         if len(set(ids)) != len(ids):
@@ -32,3 +33,8 @@ class RunReportRequest(BaseModel):
     scope: Optional[str] = None
     selected_section_ids: List[str] = Field(default_factory=list)
     prompt_overrides: Dict[str, str] = Field(default_factory=dict)  # {section_id: prompt}
+
+
+# Reusable adapter for validating raw section payloads without the cost of
+# rebuilding a model schema per call (pydantic v2 compiles this once).
+SectionListAdapter = TypeAdapter(List[Section])
@@ -1,5 +1,9 @@
 from __future__ import annotations
+import functools
+import hashlib
 import os, json, time
+import tempfile
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 import requests
@@ -8,6 +12,42 @@ import requests
 _MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "4"))
 _BACKOFF_BASE = float(os.getenv("AI_BACKOFF_BASE", "0.8"))
 
+# --- Response cache ---
+# Outline prompts, memory merges, and re-runs of the same firm/framework
+# repeat identical requests; a content-addressed cache turns those into a
+# local file read instead of a provider round-trip. Keyed on the full
+# request (provider, model, messages, sampling params), TTL-expired by
+# file mtime. LLM_CACHE_TTL=0 disables caching entirely.
+_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+_CACHE_DIR = Path(os.getenv("RUNS_PATH", "./src/data/runs")).resolve() / "llm_cache"
+
+
+def _cache_key(payload: Dict[str, Any]) -> str:
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(blob, digest_size=32).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    path = _CACHE_DIR / f"{key}.json"
+    try:
+        if time.time() - path.stat().st_mtime > _CACHE_TTL:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["text"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _cache_put(key: str, text: str) -> None:
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(_CACHE_DIR), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"text": text}, f)
+        os.replace(tmp, _CACHE_DIR / f"{key}.json")
+    except OSError:
+        # cache is best-effort; never fail the completion over it
+        pass
+
 # ---------- Utilities ----------
 def _sleep_backoff(attempt: int) -> None:
     # attempt starts from 1...
@@ -19,20 +59,26 @@ def _should_retry(status: int | None) -> bool:
 
 # ---------- Providers ----------
 # OPENAI
+@functools.lru_cache(maxsize=4)
+def _openai_client(api_key: str):
+    # one client per key: keeps httpx keep-alive connections warm across
+    # calls instead of a fresh pool (and TLS handshake) per completion
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
 def _openai_chat_complete(
     *, model: str, messages: List[Dict[str, str]],
     temperature: float, max_tokens: Optional[int], response_format: Optional[str]
 ) -> str:
-    try:
-        from openai import OpenAI
-    except Exception as e:
-        raise RuntimeError("openai package not installed. pip install openai>=1.30") from e
-
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
 
-    client = OpenAI(api_key=api_key)
+    try:
+        client = _openai_client(api_key)
+    except ImportError as e:
+        raise RuntimeError("openai package not installed. pip install openai>=1.30") from e
     kwargs: Dict[str, Any] = {
         "model": model or os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"),
         "messages": messages,
@@ -110,26 +156,170 @@ def chat_complete(
     temperature: float = 0.3,
     max_tokens: Optional[int] = None,
     response_format: Optional[str] = None,  # "json_object" or None
+    bypass_cache: bool = False,
 ) -> str:
     """
     messages: [{"role":"system"|"user"|"assistant","content": "..."}]
     provider: "openai" | "xai"
     model: provider-specific model name
+    bypass_cache: skip the local response cache for this call
     """
     provider = (provider or os.getenv("AI_PROVIDER", "openai")).lower().strip()
 
     if provider == "openai":
-        return _openai_chat_complete(
-            model=model or os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini"),
+        model = model or os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+    elif provider == "xai":
+        model = model or os.getenv("XAI_CHAT_MODEL", "grok-4-latest")
+    else:
+        raise ValueError(f"Unknown provider: {provider}")
+
+    use_cache = _CACHE_TTL > 0 and not bypass_cache
+    key = None
+    if use_cache:
+        key = _cache_key({
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+        })
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+    if provider == "openai":
+        text = _openai_chat_complete(
+            model=model,
             messages=messages, temperature=temperature,
             max_tokens=max_tokens, response_format=response_format,
         )
-    
-    if provider == "xai":
-        return _xai_chat_complete(
-            model=model or os.getenv("XAI_CHAT_MODEL", "grok-4-latest"),
+    else:
+        text = _xai_chat_complete(
+            model=model,
             messages=messages, temperature=temperature,
             max_tokens=max_tokens, response_format=None,  # ignored
         )
 
-    raise ValueError(f"Unknown provider: {provider}")
+    if use_cache and key is not None:
+        _cache_put(key, text)
+    return text
+
+
+def chat_complete_stream(
+    *,
+    provider: str,
+    model: Optional[str],
+    messages: List[Dict[str, str]],
+    temperature: float = 0.3,
+    max_tokens: Optional[int] = None,
+):
+    """
+    Streaming variant of chat_complete: yields content deltas as they
+    arrive so callers can forward tokens instead of waiting out the full
+    generation. Shares the response cache with chat_complete — a hit is
+    yielded as one chunk, a miss is cached once the stream completes.
+    Failures before the first delta (connect errors, 429/5xx on the
+    request) retry with the same backoff policy as the non-streaming
+    path; once tokens have been forwarded a restart would duplicate them
+    downstream, so mid-stream errors raise.
+    """
+    provider = (provider or os.getenv("AI_PROVIDER", "openai")).lower().strip()
+
+    if provider == "openai":
+        model = model or os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+    elif provider == "xai":
+        model = model or os.getenv("XAI_CHAT_MODEL", "grok-4-latest")
+    else:
+        raise ValueError(f"Unknown provider: {provider}")
+
+    use_cache = _CACHE_TTL > 0
+    key = None
+    if use_cache:
+        # same key shape as chat_complete so the two paths serve each other
+        key = _cache_key({
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": None,
+        })
+        cached = _cache_get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    if provider == "openai":
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY is not set")
+        try:
+            client = _openai_client(api_key)
+        except ImportError as e:
+            raise RuntimeError("openai package not installed. pip install openai>=1.30") from e
+        kwargs: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": float(temperature),
+            "stream": True,
+        }
+        if max_tokens is not None:
+            kwargs["max_tokens"] = int(max_tokens)
+
+        def _deltas():
+            for chunk in client.chat.completions.create(**kwargs):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    else:
+        api_key = os.getenv("XAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("XAI_API_KEY is not set")
+        url = os.getenv("XAI_API_URL", "https://api.x.ai/v1/chat/completions")
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "User-Agent": os.getenv("AI_USER_AGENT", "compliance-reporter/1.0"),
+        }
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": float(temperature),
+            "stream": True,
+        }
+        if max_tokens is not None:
+            payload["max_tokens"] = int(max_tokens)
+
+        def _deltas():
+            with requests.post(url, headers=headers, json=payload, stream=True, timeout=90) as r:
+                if not r.ok:
+                    raise RuntimeError(f"xAI error {r.status_code}: {r.text}")
+                for line in r.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        delta = json.loads(data).get("choices", [{}])[0].get("delta", {}).get("content")
+                    except ValueError:
+                        continue
+                    if delta:
+                        yield delta
+
+    pieces: List[str] = []
+    for attempt in range(1, _MAX_RETRIES + 1):
+        try:
+            for delta in _deltas():
+                pieces.append(delta)
+                yield delta
+            break
+        except Exception:
+            # safe to retry only while nothing has been forwarded yet —
+            # a restarted stream would replay tokens the client already has
+            if pieces or attempt >= _MAX_RETRIES:
+                raise
+            _sleep_backoff(attempt)
+
+    if use_cache and key is not None and pieces:
+        _cache_put(key, "".join(pieces))
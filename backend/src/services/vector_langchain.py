@@ -8,6 +8,11 @@ from typing import Any, Dict, List, Sequence, Optional, Tuple
 from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
 
+try:
+    from sentence_transformers import SentenceTransformer  # optional local backend
+except Exception:
+    SentenceTransformer = None
+
 
 # -----------------------------
 # Persistence / store helpers
@@ -17,10 +22,62 @@ def _persist_dir() -> str:
     Path(root).mkdir(parents=True, exist_ok=True)
     return root
 
-def _embeddings() -> OpenAIEmbeddings:
+class _LocalEmbeddings:
+    """
+    SentenceTransformer adapter with the LangChain embeddings interface.
+    One batched GPU/CPU encode per call instead of an HTTP round-trip
+    per batch to the embeddings API — throughput on an ingest-heavy box
+    is orders of magnitude higher, and ingest works offline.
+    """
+
+    def __init__(self, model_name: str, device: Optional[str], batch_size: int = 256):
+        self._model = SentenceTransformer(model_name, device=device)
+        self._batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._model.encode(
+            list(texts), batch_size=self._batch_size, convert_to_numpy=True
+        ).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+_local_embeddings: Optional[_LocalEmbeddings] = None
+
+
+def _embeddings():
+    """
+    Embedding backend: set LOCAL_EMBED_MODEL (e.g. BAAI/bge-small-en-v1.5)
+    to embed locally via sentence-transformers — LOCAL_EMBED_DEVICE picks
+    cuda/cpu. Default stays the OpenAI API. The same backend serves both
+    ingest and query so stored vectors and query vectors always come from
+    one model.
+    """
+    global _local_embeddings
+    local_model = os.getenv("LOCAL_EMBED_MODEL")
+    if local_model and SentenceTransformer is not None:
+        if _local_embeddings is None:
+            _local_embeddings = _LocalEmbeddings(
+                local_model, os.getenv("LOCAL_EMBED_DEVICE") or None
+            )
+        return _local_embeddings
     model = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
     return OpenAIEmbeddings(model=model)
 
+
+def embed_batch(texts: Sequence[str], batch_size: int = 256) -> List[List[float]]:
+    """Embed texts with the active backend in one batched call."""
+    emb = _embeddings()
+    if isinstance(emb, _LocalEmbeddings):
+        emb._batch_size = batch_size
+    return emb.embed_documents(list(texts))
+
+
+def embed_text(text: str) -> List[float]:
+    """Embed one query text with the active backend."""
+    return _embeddings().embed_query(text)
+
 def _get_store(collection_name: str) -> Chroma:
     # Chroma requires alnum, dot, underscore, hyphen; no colon.
     safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in collection_name)
@@ -49,6 +106,94 @@ def add_texts(
         pass
 
 
+# -----------------------------
+# Public: query_batch
+# -----------------------------
+def query_batch(
+    collection_name: str,
+    texts: Sequence[str],
+    k: int = 8,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Cosine top-k for many queries in one pass: all query texts are
+    embedded in a single API call and handed to Chroma as one batched
+    query, instead of paying an embedding round-trip plus a store query
+    per text. Returns one hit list per input text, entries shaped like
+    query()'s cosine results.
+    """
+    if not texts:
+        return []
+    store = _get_store(collection_name)
+    embeddings = _embeddings().embed_documents(list(texts))
+    res = store._collection.query(
+        query_embeddings=embeddings,
+        n_results=k,
+        include=["documents", "metadatas", "distances"],
+    )
+    out: List[List[Dict[str, Any]]] = []
+    for docs, metas, dists in zip(
+        res["documents"], res["metadatas"], res["distances"]
+    ):
+        hits: List[Dict[str, Any]] = []
+        for text, md, dist in zip(docs, metas, dists):
+            md = md or {}
+            hits.append({
+                "id": md.get("id"),
+                "text": text,
+                "metadata": md,
+                "score": float(dist) if dist is not None else None,
+            })
+        out.append(hits)
+    return out
+
+
+# -----------------------------
+# Public: multi_query
+# -----------------------------
+def multi_query(
+    collection_names: Sequence[str],
+    text: str,
+    k: int = 8,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Cosine top-k for one query text across several collections, paying
+    for the query embedding once instead of once per collection. Returns
+    one hit list per collection name, entries shaped like query()'s
+    cosine results plus the stored embedding (for downstream re-ranking);
+    a missing/empty collection yields an empty list.
+    """
+    if not collection_names:
+        return []
+    vec = embed_text(text)
+    out: List[List[Dict[str, Any]]] = []
+    for name in collection_names:
+        hits: List[Dict[str, Any]] = []
+        try:
+            store = _get_store(name)
+            res = store._collection.query(
+                query_embeddings=[vec],
+                n_results=k,
+                include=["documents", "metadatas", "distances", "embeddings"],
+            )
+            for doc, md, dist, emb in zip(
+                res["documents"][0], res["metadatas"][0],
+                res["distances"][0], res["embeddings"][0],
+            ):
+                md = md or {}
+                hits.append({
+                    "id": md.get("id"),
+                    "text": doc,
+                    "metadata": md,
+                    "score": float(dist) if dist is not None else None,
+                    "embedding": emb,
+                })
+        except Exception:
+            # collection may not exist yet
+            pass
+        out.append(hits)
+    return out
+
+
 # -----------------------------
 # Hybrid helper (keyword score)
 # -----------------------------
@@ -86,6 +231,7 @@ def query(
     fetch_k: Optional[int] = None,     # internal pool size for mmr/hybrid (defaults to k*4)
     alpha: float = 0.7,                # hybrid: weight for vector vs lexical (0..1)
     mmr_lambda: float = 0.5,           # mmr: diversification strength (0..1)
+    vector: Optional[List[float]] = None,  # precomputed query embedding (see embed_text)
 ) -> List[Dict[str, Any]]:
     """
     Returns a list of dicts: {id, text, metadata, score}
@@ -95,6 +241,11 @@ def query(
       - "mmr": diversified selection via Maximal Marginal Relevance
       - "hybrid": fuse vector score with cheap lexical overlap (Jaccard over tokens)
 
+    Pass vector= to reuse an embedding computed once by the caller (e.g.
+    one query searched across several collections) instead of paying an
+    embedding call per query(). text is still used for the lexical half
+    of "hybrid".
+
     Notes:
       * score is float and comparable only within a given strategy call.
       * For MMR, LangChain doesn't always expose similarity scores; we return 1.0.
@@ -103,11 +254,16 @@ def query(
     fetch_k = fetch_k or (k * 4)
 
     if strategy == "mmr":
-        retriever = store.as_retriever(
-            search_type="mmr",
-            search_kwargs={"k": k, "fetch_k": fetch_k, "lambda_mult": mmr_lambda},
-        )
-        docs = retriever.invoke(text)
+        if vector is not None:
+            docs = store.max_marginal_relevance_search_by_vector(
+                embedding=vector, k=k, fetch_k=fetch_k, lambda_mult=mmr_lambda,
+            )
+        else:
+            retriever = store.as_retriever(
+                search_type="mmr",
+                search_kwargs={"k": k, "fetch_k": fetch_k, "lambda_mult": mmr_lambda},
+            )
+            docs = retriever.invoke(text)
         out: List[Dict[str, Any]] = []
         for d in docs:
             out.append({
@@ -118,42 +274,58 @@ def query(
             })
         return out
 
-    # Base vector search (cosine) with a larger pool if needed
+    # Base vector search (cosine) with a larger pool if needed;
+    # rows are (text, metadata, distance) regardless of entry path
     pool_k = fetch_k if strategy in ("hybrid",) else k
-    docs_with_scores = store.similarity_search_with_score(text, k=pool_k)
+    if vector is not None:
+        res = store._collection.query(
+            query_embeddings=[vector],
+            n_results=pool_k,
+            include=["documents", "metadatas", "distances"],
+        )
+        pool = [
+            (doc, md or {}, float(dist) if dist is not None else None)
+            for doc, md, dist in zip(
+                res["documents"][0], res["metadatas"][0], res["distances"][0]
+            )
+        ]
+    else:
+        pool = [
+            (d.page_content, d.metadata or {}, float(s) if s is not None else None)
+            for d, s in store.similarity_search_with_score(text, k=pool_k)
+        ]
 
     if strategy == "hybrid":
-        vec_scores = [float(s) for (_, s) in docs_with_scores]
-        lex_scores = [_jaccard(_tokenize(text), _tokenize(d.page_content)) for (d, _) in docs_with_scores]
+        vec_scores = [s if s is not None else 0.0 for (_, _, s) in pool]
+        lex_scores = [_jaccard(_tokenize(text), _tokenize(t)) for (t, _, _) in pool]
 
         vec_n = _normalize(vec_scores)
         lex_n = _normalize(lex_scores)
 
-        fused: List[Tuple[float, Any]] = []
-        for (d, _), vs, ls in zip(docs_with_scores, vec_n, lex_n):
+        fused: List[Tuple[float, str, Dict[str, Any]]] = []
+        for (t, md, _), vs, ls in zip(pool, vec_n, lex_n):
             fused_score = alpha * vs + (1.0 - alpha) * ls
-            fused.append((fused_score, d))
+            fused.append((fused_score, t, md))
 
         fused.sort(key=lambda x: x[0], reverse=True)
         fused = fused[:k]
         out: List[Dict[str, Any]] = []
-        for score, d in fused:
+        for score, t, md in fused:
             out.append({
-                "id": d.metadata.get("id"),
-                "text": d.page_content,
-                "metadata": d.metadata or {},
+                "id": md.get("id"),
+                "text": t,
+                "metadata": md,
                 "score": float(score),
             })
         return out
 
     # Default: cosine top-k
-    docs_with_scores = docs_with_scores[:k]
     out: List[Dict[str, Any]] = []
-    for d, score in docs_with_scores:
+    for t, md, score in pool[:k]:
         out.append({
-            "id": d.metadata.get("id"),
-            "text": d.page_content,
-            "metadata": d.metadata or {},
-            "score": float(score) if score is not None else None,
+            "id": md.get("id"),
+            "text": t,
+            "metadata": md,
+            "score": score,
         })
     return out